@@ -0,0 +1,64 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import sys
+import time
+import numpy as np
+
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from Main_Script.constants import bigN
+from Functions.azimuthVF_function import azimuthVF
+
+##############################################
+    #    Benchmark      #
+##############################################
+# azimuthVF (arctan2 ufuncs, with and without an out= buffer) against the former
+# np.vectorize(complex) version, on V/F pairs as in the main loop (rounded coordinates,
+# artifact F rows, identical points)
+REPEAT = 5  # best of REPEAT runs
+N = (1_000, 100_000, 1_000_000)  # pairs V, F
+
+def azimuthVF_vectorize(xV, yV, xF, yF):
+    """Former azimuthVF: one Python call of complex() per element."""
+    dx = xF - xV
+    dy = yF - yV
+    d = np.vectorize(complex)(dx, dy)
+    az = ((2 * np.pi + np.pi / 2 - np.angle(d)) % (2 * np.pi)) * 180 / np.pi
+    is_same = (dx == 0) & (dy == 0)
+    az[is_same] = 360  # points are identical
+    return az
+
+def random_pairs(n, seed=0):
+    """V and F around V, with artifact F rows and identical points."""
+    rng = np.random.default_rng(seed)
+    xV, yV = rng.uniform(-1000, 1000, n).round(), rng.uniform(-1000, 1000, n).round()
+    xF, yF = (xV + rng.normal(0, 60, n)).round(), (yV + rng.normal(0, 60, n)).round()
+    artifact = rng.random(n) < 0.3
+    xF[artifact], yF[artifact] = bigN, bigN
+    same = rng.random(n) < 0.01
+    xF[same], yF[same] = xV[same], yV[same]
+    return xV, yV, xF, yF
+
+def best_time(func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+if __name__ == "__main__":
+    for n in N:
+        pairs = random_pairs(n)
+        out = np.empty(n)
+        t_ref, ref = best_time(azimuthVF_vectorize, *pairs)
+        t_new, new = best_time(azimuthVF, *pairs)
+        t_out, new_out = best_time(azimuthVF, *pairs, out=out)
+        assert np.array_equal(ref, new) and np.array_equal(ref, new_out)
+        print(f"azimuthVF: {n} pairs | np.vectorize(complex) {t_ref * 1000:.2f} ms | arctan2 {t_new * 1000:.2f} ms | "
+              f"arctan2 out= {t_out * 1000:.2f} ms | speedup x{t_ref / t_new:.0f}")
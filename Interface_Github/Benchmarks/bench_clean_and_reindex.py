@@ -0,0 +1,61 @@
+##############################################
+    #    Libraries       #  
+##############################################
+import os
+import sys
+import time
+import numpy as np
+import geopandas as gpd
+
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from Functions.vertex_store import VertexStore
+from Functions.extract_level import extract_vertex_arrays
+from Functions.extract_urb_level_and_buffered import extract_urb_vertex_arrays
+from Functions.preprocessing import promote_to_multipolygon, clean_and_reindex, insert_zero_at_the_beginning_of_1D_array, insert_bigN_at_the_beginning_of_1D_array
+from Functions.Get_directory import get_project_directories
+
+##############################################
+    #    Benchmark      #  
+##############################################
+# clean_and_reindex on the vertex matrices of the Sintra layers: consecutive duplicates
+# (shifted arrays) against the former rule (rows duplicated anywhere, lexsort of all columns)
+REPEAT = 3  # best of REPEAT runs
+
+def best_time(func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def vertex_matrix(xy):
+    """Vertex matrix as built by vertex_matrices, before clean_and_reindex."""
+    columns = {
+        'x': insert_bigN_at_the_beginning_of_1D_array(np.round(xy['x'])),
+        'y': insert_bigN_at_the_beginning_of_1D_array(np.round(xy['y'])),
+        'idx_feat': insert_zero_at_the_beginning_of_1D_array(xy['L3']),
+        'idx_part': insert_zero_at_the_beginning_of_1D_array(xy['part']),
+    }
+    if 'buffered' in xy:
+        columns['buffered'] = insert_zero_at_the_beginning_of_1D_array(xy['buffered'])
+    return VertexStore(columns)
+
+if __name__ == "__main__":
+    INPUT_FOLDER, _ = get_project_directories()
+    layers = {name: extract_vertex_arrays(promote_to_multipolygon(gpd.read_file(os.path.join(INPUT_FOLDER, name))))
+              for name in ["high_risk_sintra.shp", "all_risk_sintra.shp"]}
+    # merged urban + buffer layer (not always shipped with the repository)
+    urban_path = os.path.join(INPUT_FOLDER, "urban_sintra.shp")
+    if os.path.exists(urban_path):
+        layers["urban_sintra.shp"] = extract_urb_vertex_arrays(gpd.read_file(urban_path), col='layer', value='Buffered')
+    for name, xy in layers.items():
+        mat = vertex_matrix(xy)
+        t_old, old = best_time(clean_and_reindex, mat, "idx_part", "idx_vert", consecutive=False)
+        t_new, new = best_time(clean_and_reindex, mat, "idx_part", "idx_vert")
+        print(f"{name}: {len(mat)} vertices | removed: former {len(mat) - len(old)}, consecutive {len(mat) - len(new)} | "
+              f"former {t_old:.3f}s | consecutive {t_new:.3f}s | speedup x{t_old / t_new:.1f}")
@@ -0,0 +1,88 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import sys
+import time
+import numpy as np
+
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from Main_Script.constants import KDTREE_DIST_UPPERBOUND, limiar, limiartheta, QT, bigN
+from Functions.decision import decision, decision_fused, decision_batched, DecisionBuffers
+
+##############################################
+    #    Benchmark      #
+##############################################
+REPEAT = 5  # best of REPEAT runs
+N = 200_000  # urban vertices
+ARTIFACT_SHARE = 0.5  # share of V without a flammable neighbour within D (F = artifact point)
+KF = 10  # protectors per V (batched decision)
+BATCH_ROWS = (200, 2_000, 20_000)  # V of the batched decision benchmark
+
+def random_triples(n, seed=0):
+    """V, F and (WWW, W, WW) around each other, with artifact F rows, coincident points and NaNs."""
+    rng = np.random.default_rng(seed)
+    xV, yV = rng.uniform(-1000, 1000, n).round(), rng.uniform(-1000, 1000, n).round()
+    xF, yF = (xV + rng.normal(0, 60, n)).round(), (yV + rng.normal(0, 60, n)).round()
+    xW, yW = (xV + rng.normal(0, 40, n)).round(), (yV + rng.normal(0, 40, n)).round()
+    xWW, yWW = (xW + rng.normal(0, 20, n)).round(), (yW + rng.normal(0, 20, n)).round()
+    xWWW, yWWW = (xW + rng.normal(0, 20, n)).round(), (yW + rng.normal(0, 20, n)).round()
+    artifact = rng.random(n) < ARTIFACT_SHARE
+    xF[artifact], yF[artifact] = bigN, bigN
+    same = rng.random(n) < 0.01
+    xW[same], yW[same] = xV[same], yV[same]
+    xWW[::997] = np.nan
+    return xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW
+
+def loop_over_protectors(Q, xV, yV, xF, yF, W, buffers):
+    """One decision_fused call per protector column, OR-combined (the main loop without batching)."""
+    protected = np.zeros(len(xV), dtype=bool)
+    out = np.empty(len(xV), dtype=bool)
+    for j in range(W[0].shape[1]):
+        protected |= decision_fused(Q, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, *(a[:, j] for a in W), out=out, buffers=buffers)
+    return protected
+
+def best_time(func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+if __name__ == "__main__":
+    Q = QT / 100
+    # test_decision.py vectors (integer inputs)
+    xV = np.array([0,0,0,0,0,0,0,0,0]); yV = np.array([0,0,0,5,5,5,20,20,20])
+    xF = np.array([10,10,10,10,10,10,10,10,10]); yF = np.array([0,5,10,0,5,10,0,5,10])
+    xW = np.array([5,5,5,5,5,5,5,5,5]); yW = np.array([-2,3,8,-2,3,8,-2,3,8])
+    xWW = np.array([5,5,5,5,5,5,5,5,5]); yWW = np.array([-7,-2,3,-7,-2,3,-7,-2,3])
+    xWWW = np.array([5,5,5,5,5,5,5,5,5]); yWWW = np.array([3,8,13,3,8,13,3,8,13])
+    small = (xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW)
+    for q in (QT, Q):
+        assert np.array_equal(decision(q, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, *small),
+                              decision_fused(q, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, *small))
+
+    triples = random_triples(N)
+    buffers = DecisionBuffers(N)
+    out = np.empty(N, dtype=bool)
+    t_ref, ref = best_time(decision, Q, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, *triples)
+    t_fused, fused = best_time(decision_fused, Q, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, *triples, out=out, buffers=buffers)
+    assert np.array_equal(ref, fused)
+    print(f"decision: {N} triples ({ARTIFACT_SHARE:.0%} artifact F, {ref.mean():.1%} protected) | "
+          f"reference {t_ref * 1000:.1f} ms | fused {t_fused * 1000:.1f} ms | speedup x{t_ref / t_fused:.1f}")
+
+    # KF protectors per V: KF calls on columns of n rows against one batched call;
+    # small n (active set, small tiles) is where the per-call overhead dominates
+    buffers = DecisionBuffers(N)
+    for n in BATCH_ROWS:
+        xV, yV, xF, yF = (a[:n] for a in triples[:4])
+        W = [a[:n * KF].reshape(n, KF) for a in triples[4:]]
+        t_loop, looped = best_time(loop_over_protectors, Q, xV, yV, xF, yF, W, buffers)
+        t_batch, batched = best_time(decision_batched, Q, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, *W, buffers=buffers)
+        assert np.array_equal(looped, batched)
+        print(f"decision: {n} V x {KF} protectors | loop over protectors {t_loop * 1000:.2f} ms | batched {t_batch * 1000:.2f} ms | speedup x{t_loop / t_batch:.1f}")
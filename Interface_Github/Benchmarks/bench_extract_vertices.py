@@ -0,0 +1,48 @@
+##############################################
+    #    Libraries       #  
+##############################################
+import os
+import sys
+import time
+import geopandas as gpd
+import pandas as pd
+
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from Functions.extract_level import extract_vertices
+from Functions.extract_urb_level_and_buffered import extract_urb_vertices_and_buffered
+from Functions.preprocessing import promote_to_multipolygon
+from Functions.Get_directory import get_project_directories
+
+##############################################
+    #    Benchmark      #  
+##############################################
+REPEAT = 3  # best of REPEAT runs
+
+def best_time(func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+if __name__ == "__main__":
+    INPUT_FOLDER, _ = get_project_directories()
+    for name in ["high_risk_sintra.shp", "all_risk_sintra.shp"]:
+        flam = promote_to_multipolygon(gpd.read_file(os.path.join(INPUT_FOLDER, name)))
+        t_loop, xy_loop = best_time(extract_vertices, flam, columnar=False)
+        t_col, xy_col = best_time(extract_vertices, flam, columnar=True)
+        pd.testing.assert_frame_equal(xy_loop, xy_col)  # same x/y/L1/L2/L3/part output
+        print(f"{name}: {len(xy_col)} vertices | loop {t_loop:.3f}s | columnar {t_col:.3f}s | speedup x{t_loop / t_col:.1f}")
+    # merged urban + buffer layer (not always shipped with the repository)
+    urban_path = os.path.join(INPUT_FOLDER, "urban_sintra.shp")
+    if os.path.exists(urban_path):
+        urb = gpd.read_file(urban_path)
+        t_loop, xy_loop = best_time(extract_urb_vertices_and_buffered, urb, col='layer', value='Buffered', columnar=False)
+        t_col, xy_col = best_time(extract_urb_vertices_and_buffered, urb, col='layer', value='Buffered', columnar=True)
+        pd.testing.assert_frame_equal(xy_loop, xy_col, check_dtype=False)  # same values, compact dtypes
+        print(f"urban_sintra.shp: {len(xy_col)} vertices | loop {t_loop:.3f}s | columnar {t_col:.3f}s | speedup x{t_loop / t_col:.1f}")
@@ -0,0 +1,41 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import sys
+import time
+import resource
+import subprocess
+
+##############################################
+    #    Benchmark      #
+##############################################
+# Peak resident memory of one run of Main_Script/Main.py (as configured in constants.py).
+# usage: python bench_peak_memory.py [path/to/Main.py]
+# Pass the Main.py of another checkout to compare two versions.
+
+def peak_memory_of(main_path):
+    """
+    Input:
+    main_path (str): path to Main.py
+
+    Output:
+    (return code, elapsed seconds, peak RSS in MB) of a run in a fresh process
+    """
+    env = dict(os.environ, MPLBACKEND="Agg")
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, os.path.basename(main_path)], cwd=os.path.dirname(os.path.abspath(main_path)),
+                          env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+    # ru_maxrss is in kilobytes on Linux (bytes on macOS); only one child has been waited for
+    maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return proc.returncode, elapsed, maxrss / scale
+
+if __name__ == "__main__":
+    default_main = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Main_Script", "Main.py")
+    main_path = sys.argv[1] if len(sys.argv) > 1 else default_main
+    rc, elapsed, peak_mb = peak_memory_of(main_path)
+    print(f"{main_path}: rc={rc} | {elapsed:.1f}s | peak RSS {peak_mb:.0f} MB")
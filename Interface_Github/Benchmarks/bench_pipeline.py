@@ -0,0 +1,269 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+import numpy as np
+import scipy
+import shapely
+import geopandas as gpd
+from shapely.geometry import Polygon
+
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from Main_Script.constants import (QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, bigN, smallN, POSVALUE, NEGVALUE, d_box,
+                                   KDTREE_BALANCED_TREE, KDTREE_COMPACT_NODES)
+from Functions.Get_directory import get_project_directories
+from Functions.vertex_store import VertexStore
+from Functions.bounding_box import create_bounding_box
+from Functions.read_layer import read_layer
+from Functions.preprocessing import (promote_to_multipolygon, process_flammables, clean_and_reindex,
+                                     insert_zero_at_the_beginning_of_1D_array, insert_bigN_at_the_beginning_of_1D_array)
+from Functions.extract_level import extract_vertex_arrays
+from Functions.extract_urb_level_and_buffered import extract_urb_vertex_arrays
+from Functions.convert_3763_XY_into_urban_closest_vertex import read_urban_and_snap
+from Functions.vertex_matrices import flam_vertex_matrix, urb_vertex_matrix, link_layers
+from Functions.nearest_neighbor_function import nearest_indices
+from Functions.index import idxneigh
+from Functions.main_script_functions import get_neighbors
+from Functions.decision import decision_fused, DecisionBuffers
+from Functions.azimuthVF_function import azimuthVF
+from Functions.interface_engine import compute_interface
+from Functions.interface_segments import interface_points, segment_table
+from Functions.ftype import ftype
+from Benchmarks.bench_peak_memory import peak_memory_of
+
+##############################################
+    #    Benchmark      #
+##############################################
+# Stage timings of the interface pipeline (vertex extraction, duplicates, neighbour searches,
+# neighbours along the rings, decision, azimuths, main algorithm, segment table) and of the whole
+# pipeline, on synthetic grids of urban blocks and flammable patches and on the Sintra layers of Data/.
+# Results go to a JSON file (one record per fixture and stage) to follow the engine from commit to commit.
+# usage: python bench_pipeline.py [--grid 10 30] [--sintra high_risk_sintra.shp] [--K 10 --KF 10]
+#                                 [--main] [--json results.json] [--compare previous.json]
+REPEAT = 3  # best of REPEAT runs
+GRID = (10, 30)  # synthetic fixtures: GRID x GRID urban blocks
+SINTRA = ("high_risk_sintra.shp",)  # flammable layers of Data/ (with urban_sintra.shp, when present)
+SINTRA_POINT = (-97403.9, -101304.0)  # test point of Main.py: the Sintra fixtures are its box of d_box
+BLOCK = 60  # distance (m) between the blocks of the synthetic grid
+K, KF = 10, 10  # flammable / urban neighbors to explore (constants.py has the values of the full runs)
+
+def best_time(func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def grid_layers(n, seed=0):
+    """
+    Input:
+    n (int): the urban layer has n x n blocks
+    seed (int): random jitter of the corners
+
+    Output:
+    (flam, urb) GeoDataFrames in EPSG:3763: jittered urban blocks with their negative buffers
+    ('layer'="Buffered") and flammable patches between two blocks out of three, edges densified
+    every 5 m and coordinates rounded to metres (as the main script)
+    """
+    rng = np.random.default_rng(seed)
+    def jittered_square(x, y, side):
+        corners = np.array([[x, y], [x + side, y], [x + side, y + side], [x, y + side]], dtype=float)
+        return shapely.segmentize(Polygon(np.round(corners + rng.uniform(-4, 4, corners.shape))), 5)
+    blocks = [jittered_square(BLOCK * i, BLOCK * j, 30) for i in range(n) for j in range(n)]
+    buffers = [block.buffer(-3, join_style=2) for block in blocks]
+    urb = gpd.GeoDataFrame({'layer': ['Original'] * len(blocks) + ['Buffered'] * len(buffers)}, geometry=blocks + buffers, crs="EPSG:3763")
+    patches = [jittered_square(BLOCK * i + 35, BLOCK * j + 35, 18) for i in range(n) for j in range(n) if (i + j) % 3]
+    flam = gpd.GeoDataFrame(geometry=patches, crs="EPSG:3763")
+    return promote_to_multipolygon(flam), urb
+
+def sintra_layers(name, INPUT_FOLDER):
+    """
+    Input:
+    name (str): flammable layer of INPUT_FOLDER
+    INPUT_FOLDER (str): Data folder
+
+    Output:
+    (flam, urb): the layers in the box of d_box around SINTRA_POINT, read and clipped as by Main.py
+    with TESTIDX; urb is None when urban_sintra.shp is not in INPUT_FOLDER (not always shipped
+    with the repository), the box is then centred on SINTRA_POINT itself
+    """
+    urban_path = os.path.join(INPUT_FOLDER, "urban_sintra.shp")
+    x0, y0 = SINTRA_POINT
+    urb = None
+    if os.path.exists(urban_path):
+        x0y0, urb = read_urban_and_snap(x0, y0, urban_path, d_box, KDTREE_DIST_UPPERBOUND, columns=['layer'])
+        x0, y0 = x0y0['X'].values[0], x0y0['Y'].values[0]
+    BOX = create_bounding_box(x0, y0, d_box)
+    flam = read_layer(os.path.join(INPUT_FOLDER, name), BOX, margin=KDTREE_DIST_UPPERBOUND, columns=[])
+    flam = process_flammables(promote_to_multipolygon(flam), BOX)
+    if not os.path.exists(urban_path):
+        return flam, None
+    if urb is None:
+        urb = read_layer(urban_path, BOX, margin=KDTREE_DIST_UPPERBOUND, crs=flam.crs, columns=['layer'])
+    return flam, process_flammables(urb.to_crs(flam.crs), BOX)
+
+def raw_vertex_matrix(xy, suffix, buffered=False):
+    """Vertex matrix of vertex_matrices before clean_and_reindex (the input of that stage)."""
+    columns = {
+        'x': insert_bigN_at_the_beginning_of_1D_array(np.round(xy['x'])),
+        'y': insert_bigN_at_the_beginning_of_1D_array(np.round(xy['y'])),
+        f'idx_feat_{suffix}': insert_zero_at_the_beginning_of_1D_array(xy['L3']),
+        f'idx_part_{suffix}': insert_zero_at_the_beginning_of_1D_array(xy['part'])
+    }
+    if buffered:
+        columns['buffered'] = insert_zero_at_the_beginning_of_1D_array(xy['buffered'])
+    return VertexStore(columns)
+
+def run_pipeline(flam, urb, K, KF):
+    """
+    Input:
+    flam, urb (GeoDataFrames): layers, already clipped (Reading Part of Main.py without the files)
+    K, KF : flammable / urban neighbors to explore
+
+    Output:
+    VertexStore: segment table of the urban vertices (as xydDT of Main.py)
+    """
+    mat_flam, mat_urb = flam_vertex_matrix(flam), urb_vertex_matrix(urb)
+    urb_tree, flam_tree = link_layers(mat_urb, mat_flam, KDTREE_DIST_UPPERBOUND, bigN, balanced_tree=KDTREE_BALANCED_TREE, compact_nodes=KDTREE_COMPACT_NODES)
+    knn_idx, knn_dists = nearest_indices(mat_flam, mat_urb, k=K, return_distance=True, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND, bigN=bigN,
+                                         tree=flam_tree, as_frame=False)
+    result = compute_interface(mat_urb, mat_flam, knn_idx, knn_dists, urb_tree, list(range(1, K + 1)), list(range(1, KF + 1)), KF, QT,
+                               KDTREE_DIST_UPPERBOUND, limiar, limiartheta, bigN, smallN, POSVALUE, NEGVALUE, TESTIDX=True, verbose=False)
+    return segment_table(interface_points(output_points(mat_urb, mat_flam, knn_dists, result), POSVALUE, NEGVALUE), NEGVALUE)
+
+def output_points(mat_urb, mat_flam, knn_dists, result):
+    """xyd of the select part of Main.py (one row per urban vertex)."""
+    return VertexStore({
+        'x': mat_urb['x'],
+        'y': mat_urb['y'],
+        'buffered': mat_urb['buffered'],
+        'idx_part_u': mat_urb['idx_part_urb'],
+        'idx_feat_u': mat_urb['idx_feat_urb'],
+        'idx_vert_u': mat_urb['idx_vert_urb'],
+        'vert_type': ftype(result['dF'], KDTREE_DIST_UPPERBOUND),
+        'idx_feat_f': mat_flam['idx_feat_flam'][result['idxF']],
+        'dist_feat_f': knn_dists[:, 0],
+        'd': result['dF'],
+        'az': result['azF'],
+        'iF': result['iF'],
+        'interface': result['interface'].astype(int)
+    })
+
+def stage_timings(fixture, flam, urb, K, KF):
+    """
+    Input:
+    fixture (str): name of the fixture in the records
+    flam, urb (GeoDataFrames): layers (urb None: only the stages of the flammable layer)
+    K, KF : flammable / urban neighbors to explore
+
+    Output:
+    list of records {'fixture', 'stage', 'n', 'seconds'} (best of REPEAT; n = rows of the stage)
+    """
+    records = []
+    def timed(stage, rows, func, *args, **kwargs):
+        seconds, result = best_time(func, *args, **kwargs)
+        n = rows(result) if callable(rows) else rows
+        records.append({'fixture': fixture, 'stage': stage, 'n': n, 'seconds': seconds})
+        print(f"{fixture:>20} | {stage:<22} | {n:>9} rows | {seconds * 1000:10.2f} ms")
+        return result
+    vertices = lambda xy: len(xy['x'])
+    # vertex arrays of the layers and duplicates
+    xy_flam = timed('extract_vertices_flam', vertices, extract_vertex_arrays, flam)
+    timed('clean_and_reindex_flam', vertices(xy_flam) + 1, clean_and_reindex, raw_vertex_matrix(xy_flam, 'flam'), 'idx_part_flam', 'idx_vert_flam')
+    if urb is None:
+        return records
+    xy_urb = timed('extract_vertices_urb', vertices, extract_urb_vertex_arrays, urb, col='layer', value='Buffered')
+    timed('clean_and_reindex_urb', vertices(xy_urb) + 1, clean_and_reindex, raw_vertex_matrix(xy_urb, 'urb', buffered=True), 'idx_part_urb', 'idx_vert_urb')
+    # neighbour searches: KD-trees and nearest vertex of the other layer, K flammable neighbors of the urban vertices
+    mat_flam, mat_urb = flam_vertex_matrix(flam), urb_vertex_matrix(urb)
+    urb_tree, flam_tree = timed('link_layers', len(mat_urb) + len(mat_flam), link_layers, mat_urb, mat_flam, KDTREE_DIST_UPPERBOUND, bigN,
+                                balanced_tree=KDTREE_BALANCED_TREE, compact_nodes=KDTREE_COMPACT_NODES)
+    knn_idx, knn_dists = timed('nearest_indices', len(mat_urb), nearest_indices, mat_flam, mat_urb, k=K, return_distance=True,
+                               KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND, bigN=bigN, tree=flam_tree, as_frame=False)
+    # neighbours along the rings: F, FF, FFF of the closest flammable neighbor, W, WW, WWW of the closest other urban vertex
+    timed('idxneigh', len(mat_urb), idxneigh, mat_urb, np.arange(len(mat_urb)), 'urb')
+    xF, yF, xFF, yFF, xFFF, yFFF, _ = timed('get_neighbors', len(mat_urb), get_neighbors, mat_flam, knn_idx[:, 0], idxneigh, 'flam', feat_col='idx_feat_flam')
+    kvw_idx = nearest_indices(mat_urb, mat_urb, k=2, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND, bigN=bigN, tree=urb_tree, as_frame=False)
+    xW, yW, xWW, yWW, xWWW, yWWW, _ = get_neighbors(mat_urb, kvw_idx[:, 1], idxneigh, 'urb', feat_col='idx_feat_urb')
+    xV, yV = np.asarray(mat_urb['x']), np.asarray(mat_urb['y'])
+    buffers, out = DecisionBuffers(len(xV)), np.empty(len(xV), dtype=bool)
+    timed('decision', len(xV), decision_fused, QT / 100, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW,
+          out=out, buffers=buffers)
+    timed('azimuthVF', len(xV), azimuthVF, xV, yV, xF, yF, out=np.empty(len(xV)))
+    # main algorithm and segment table (xydDT)
+    result = timed('compute_interface', len(mat_urb), compute_interface, mat_urb, mat_flam, knn_idx, knn_dists, urb_tree, list(range(1, K + 1)),
+                   list(range(1, KF + 1)), KF, QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, bigN, smallN, POSVALUE, NEGVALUE, TESTIDX=True, verbose=False)
+    xyd = interface_points(output_points(mat_urb, mat_flam, knn_dists, result), POSVALUE, NEGVALUE)
+    timed('segment_table', len(xyd), segment_table, xyd, NEGVALUE)
+    # whole pipeline, from the layers to xydDT
+    timed('end_to_end', len, run_pipeline, flam, urb, K, KF)
+    return records
+
+def git_commit():
+    """Commit of the working tree (None outside a git checkout)."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=parent_dir, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(records, previous_path):
+    """Prints the ratio of every stage time to the same fixture and stage of a previous JSON file."""
+    with open(previous_path) as f:
+        previous = {(r['fixture'], r['stage']): r['seconds'] for r in json.load(f)['results']}
+    print('compared with', previous_path, '(time / previous time)')
+    for r in records:
+        before = previous.get((r['fixture'], r['stage']))
+        if before:
+            print(f"{r['fixture']:>20} | {r['stage']:<22} | {before * 1000:10.2f} ms -> {r['seconds'] * 1000:10.2f} ms | x{r['seconds'] / before:.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage timings of the interface pipeline (JSON results)")
+    parser.add_argument('--grid', type=int, nargs='*', default=list(GRID), help="sizes of the synthetic grids (blocks per side)")
+    parser.add_argument('--sintra', nargs='*', default=list(SINTRA), help="flammable layers of Data/ (none: only the synthetic grids)")
+    parser.add_argument('--K', type=int, default=K, help="flammable neighbors")
+    parser.add_argument('--KF', type=int, default=KF, help="urban neighbors")
+    parser.add_argument('--main', action='store_true', help="also time a run of Main_Script/Main.py as configured (with its peak memory)")
+    parser.add_argument('--json', help="results file (default: Output/benchmarks/bench_pipeline_<time>.json)")
+    parser.add_argument('--compare', help="results file of a previous run")
+    args = parser.parse_args()
+
+    INPUT_FOLDER, OUTPUT_FOLDER = get_project_directories()
+    records = []
+    for n in args.grid:
+        flam, urb = grid_layers(n)
+        records += stage_timings(f"grid{n}", flam, urb, args.K, args.KF)
+    for name in args.sintra:
+        flam, urb = sintra_layers(name, INPUT_FOLDER)
+        if urb is None:
+            print(name, ': urban_sintra.shp not in', INPUT_FOLDER, '- only the stages of the flammable layer')
+        records += stage_timings(os.path.splitext(name)[0], flam, urb, args.K, args.KF)
+    if args.main:
+        main_path = os.path.join(parent_dir, "Main_Script", "Main.py")
+        rc, elapsed, peak_mb = peak_memory_of(main_path)
+        records.append({'fixture': 'Main.py', 'stage': 'end_to_end', 'n': None, 'seconds': elapsed, 'returncode': rc, 'peak_rss_mb': peak_mb})
+        print(f"{'Main.py':>20} | {'end_to_end':<22} | rc={rc} | {elapsed:.1f} s | peak RSS {peak_mb:.0f} MB")
+
+    results = {
+        'meta': {'date': time.strftime('%Y-%m-%dT%H:%M:%S'), 'commit': git_commit(), 'repeat': REPEAT, 'K': args.K, 'KF': args.KF,
+                 'python': platform.python_version(), 'numpy': np.__version__, 'scipy': scipy.__version__, 'shapely': shapely.__version__,
+                 'geopandas': gpd.__version__, 'machine': platform.machine(), 'processor': platform.processor(), 'cpus': os.cpu_count()},
+        'results': records
+    }
+    json_path = args.json or os.path.join(OUTPUT_FOLDER, "benchmarks", f"bench_pipeline_{time.strftime('%Y%m%d_%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+    with open(json_path, 'w') as f:
+        json.dump(results, f, indent=1)
+    print(json_path)
+    if args.compare:
+        compare(records, args.compare)
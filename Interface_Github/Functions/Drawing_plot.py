@@ -5,6 +5,7 @@ import geopandas as gpd
 import matplotlib.pyplot as plt
 from matplotlib.patches import Circle
 import numpy as np
+from Functions.read_layer import read_layer
 ##############################################
     #    Main Function       #  
 ##############################################
@@ -18,8 +19,8 @@ def full_plot_function(ax, flammable_path, urban_path, mat_urb_df, mat_flam_df,
     # Load and crop geospatial files only once
     flammable_gdf, urban_gdf = None, None
     if mode in ['all', 'plot_cropped_background_layout']:
-        flammable_gdf = gpd.read_file(flammable_path).clip([BOX['xmin'], BOX['ymin'], BOX['xmax'], BOX['ymax']])
-        urban_gdf = gpd.read_file(urban_path).clip([BOX['xmin'], BOX['ymin'], BOX['xmax'], BOX['ymax']])
+        flammable_gdf = read_layer(flammable_path, BOX, columns=[]).clip([BOX['xmin'], BOX['ymin'], BOX['xmax'], BOX['ymax']])
+        urban_gdf = read_layer(urban_path, BOX, columns=[]).clip([BOX['xmin'], BOX['ymin'], BOX['xmax'], BOX['ymax']])
 
         # Crop data frames to the bounding box
         mat_urb_df_cropped = mat_urb_df[(mat_urb_df['x'].between(BOX['xmin'], BOX['xmax'])) & 
@@ -1,19 +1,34 @@
 ##############################################
-    #    Library     #  
+    #    Library     #
 ##############################################
 import numpy as np
 
 ##############################################
-    #    Main Function       #  
+    #    Main Function       #
 ##############################################
 
-def azimuthVF(xV, yV, xF, yF):
-    dx = xF - xV
-    dy = yF - yV
-    d = np.vectorize(complex)(dx, dy)  
-    az = ((2 * np.pi + np.pi / 2 - np.angle(d)) % (2 * np.pi)) * 180 / np.pi
+def azimuthVF(xV, yV, xF, yF, out=None):
+    """
+    Input:
+    xV, yV, xF, yF (arrays or floats): coordinates of V and F
+    out (float array, optional): output buffer with the shape of the inputs
+
+    Output:
+    float array (out): azimuth (degrees, clockwise from north, in [0, 360)) of F seen from V;
+    360 where V and F are identical points
+    """
+    dx = np.subtract(xF, xV)
+    dy = np.subtract(yF, yV)
+    if out is None:
+        out = np.empty(np.broadcast(dx, dy).shape)
+    # angle of the complex number dx + i*dy (np.angle), in ufuncs: no Python loop per element
+    az = np.arctan2(dy, dx, out=out)
+    np.subtract(2 * np.pi + np.pi / 2, az, out=az)
+    np.remainder(az, 2 * np.pi, out=az)
+    np.multiply(az, 180, out=az)
+    np.divide(az, np.pi, out=az)
     is_same = (dx == 0) & (dy == 0)
-    az[is_same] = 360  # points are identical
+    np.copyto(az, 360, where=is_same)  # points are identical
     return az
 
 
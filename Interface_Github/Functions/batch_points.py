@@ -0,0 +1,160 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+##############################################
+    #    Import Functions       #
+##############################################
+from Functions.vertex_store import VertexStore
+from Functions.bounding_box import create_bounding_box
+from Functions.read_layer import read_layer
+from Functions.preprocessing import promote_to_multipolygon, process_flammables
+from Functions.convert_3763_XY_into_urban_closest_vertex import read_urban_and_snap
+from Functions.vertex_matrices import flam_vertex_matrix, urb_vertex_matrix, link_layers
+from Functions.nearest_neighbor_function import nearest_indices
+from Functions.interface_engine import compute_interface
+from Functions.interface_segments import interface_points, segment_table
+from Functions.ftype import ftype
+
+##############################################
+    #    Batch of Points      #
+##############################################
+# Several test points (TESTIDX mode of Main.py) in one run: the layers are read once (window
+# covering every box), each point is clipped from them with the spatial index built on the first
+# clip, and the main algorithm of the points runs in parallel processes.
+
+OUTPUT_VARS = ['x', 'y', 'vert_type', 'linkL', 'linkR', 'idx_vert_u', 'idx_part_u', 'interface', 'd'] # columns of the CSV of each point (as Main.py)
+
+def read_points(points, d_box):
+    """
+    Input:
+    points : CSV file with columns X, Y and optionally d_box and name, or list of (X, Y) / (X, Y, d_box)
+        (EPSG:3763, as X,Y of Main.py)
+    d_box (float): half side of the boxes without a d_box value
+
+    Output:
+    DataFrame with columns name, X, Y, d_box (one row per point)
+    """
+    if isinstance(points, str):
+        table = pd.read_csv(points)
+    else:
+        rows = [tuple(point) for point in points]
+        table = pd.DataFrame(rows, columns=['X', 'Y', 'd_box'][:max(map(len, rows))])
+    if 'd_box' not in table:
+        table['d_box'] = d_box
+    table['d_box'] = table['d_box'].fillna(d_box)
+    if 'name' not in table:
+        table['name'] = [f"point{i}" for i in range(1, len(table) + 1)]
+    return table[['name', 'X', 'Y', 'd_box']]
+
+def interface_of_point(task):
+    """Neighbour searches, main algorithm and output table of one point (run in a worker process)."""
+    mat_urb, mat_flam, output_path, settings = task
+    start = time.perf_counter()
+    K, D, bigN = settings.pop('K'), settings['KDTREE_DIST_UPPERBOUND'], settings['bigN']
+    urb_tree, flam_tree = link_layers(mat_urb, mat_flam, D, bigN, balanced_tree=settings.pop('balanced_tree'), compact_nodes=settings.pop('compact_nodes'),
+                                      workers=settings['workers'], compact_dtypes=settings.pop('compact_dtypes'))
+    knn_idx, knn_dists = nearest_indices(mat_flam, mat_urb, k=K, return_distance=True, KDTREE_DIST_UPPERBOUND=D, bigN=bigN, tree=flam_tree,
+                                         workers=settings['workers'], as_frame=False, canonical_ties=settings['canonical_ties'])
+    result = compute_interface(mat_urb, mat_flam, knn_idx, knn_dists, urb_tree, TESTIDX=True, verbose=False, **settings)
+    # output table, as the select part of Main.py
+    xyd = VertexStore({
+        'x': mat_urb['x'],
+        'y': mat_urb['y'],
+        'buffered': mat_urb['buffered'],
+        'idx_part_u': mat_urb['idx_part_urb'],
+        'idx_feat_u': mat_urb['idx_feat_urb'],
+        'idx_vert_u': mat_urb['idx_vert_urb'],
+        'vert_type': ftype(result['dF'], D),
+        'idx_feat_f': mat_flam['idx_feat_flam'][result['idxF']],
+        'dist_feat_f': knn_dists[:, 0],
+        'd': result['dF'],
+        'az': result['azF'],
+        'iF': result['iF'],
+        'interface': result['interface'].astype(int)
+    })
+    xyd = interface_points(xyd, settings['POSVALUE'], settings['NEGVALUE'])
+    xydDT = segment_table(xyd, settings['NEGVALUE']).select(OUTPUT_VARS)
+    xydDT.to_pandas().to_csv(output_path, sep=',', index=False)
+    return {'urban_vertices': len(mat_urb) - 1, 'flammable_vertices': len(mat_flam) - 1,
+            'interface_vertices': int(np.count_nonzero(xyd['interface'])), 'seconds': round(time.perf_counter() - start, 3)}
+
+def compute_interfaces_batch(points, flammable_path, urban_path, OUTPUT_FOLDER, extraname, d_box, K, KS, KFS, KF, QT, KDTREE_DIST_UPPERBOUND,
+                             limiar, limiartheta, bigN, smallN, POSVALUE, NEGVALUE, processes=1, workers=1, active_set=True, canonical_ties=True,
+                             threads=1, batch=0, balanced_tree=True, compact_nodes=True, compact_dtypes=False, use_arrow=False):
+    """
+    Interface of several test points in one pass: the same result as a run of Main.py with TESTIDX
+    at each point, without reading and indexing the layers again for every point.
+
+    Input:
+    points : see read_points
+    flammable_path, urban_path (str): input layers
+    OUTPUT_FOLDER (str): one CSV per point (named as by Main.py) and the summary CSV
+    extraname (str): part of the output names (as Main.py with TESTIDX, e.g. "test-AR2019")
+    d_box (float): default half side of the boxes (m)
+    K, KS, KFS, KF, QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, bigN, smallN, POSVALUE, NEGVALUE : constants
+    processes (int or None): worker processes sharing the points (None = all cores)
+    workers, active_set, canonical_ties, threads, batch : see compute_interface
+    balanced_tree, compact_nodes : KD-tree options (see VertexTree)
+    compact_dtypes : int32 indices and float32 distances (see link_layers)
+    use_arrow : see read_layer
+
+    Output:
+    DataFrame: one row per point (name, X, Y, x0, y0, d_box, vertices, interface vertices,
+    seconds of the main algorithm, output file), also written to OUTPUT_FOLDER
+    """
+    start = time.perf_counter()
+    table = read_points(points, d_box)
+    # closest urban vertex of every point: one read of the urban layer around the points (covering every box), one tree query
+    x0y0, urb = read_urban_and_snap(table['X'].values, table['Y'].values, urban_path, table['d_box'].values, KDTREE_DIST_UPPERBOUND,
+                                    columns=['layer'], use_arrow=use_arrow)
+    table['x0'], table['y0'] = x0y0['X'].values, x0y0['Y'].values
+    # one read of each layer: the window covering every box (plus KDTREE_DIST_UPPERBOUND, as Main.py)
+    window = {'xmin': (table['x0'] - table['d_box']).min(), 'xmax': (table['x0'] + table['d_box']).max(),
+              'ymin': (table['y0'] - table['d_box']).min(), 'ymax': (table['y0'] + table['d_box']).max()}
+    flam = read_layer(flammable_path, window, margin=KDTREE_DIST_UPPERBOUND, columns=[], use_arrow=use_arrow)
+    flam = promote_to_multipolygon(flam)
+    if urb is None:  # a point was snapped on the whole layer
+        urb = read_layer(urban_path, window, margin=KDTREE_DIST_UPPERBOUND, crs=flam.crs, columns=['layer'], use_arrow=use_arrow)
+    urb = urb.to_crs(flam.crs)
+    print('layers read:', len(flam), 'flammable and', len(urb), 'urban features', f'({time.perf_counter() - start:.1f} s)')
+    settings = dict(K=K, KS=KS, KFS=KFS, KF=KF, QT=QT, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND, limiar=limiar, limiartheta=limiartheta,
+                    bigN=bigN, smallN=smallN, POSVALUE=POSVALUE, NEGVALUE=NEGVALUE, workers=workers, active_set=active_set,
+                    canonical_ties=canonical_ties, threads=threads, batch=batch, balanced_tree=balanced_tree, compact_nodes=compact_nodes,
+                    compact_dtypes=compact_dtypes)
+    tasks, names = [], []
+    for point in table.itertuples():
+        d = int(point.d_box) if float(point.d_box).is_integer() else point.d_box
+        BOX = create_bounding_box(point.x0, point.y0, d)
+        # vertex matrices of the features in BOX (the spatial indexes of flam and urb are built once)
+        mat_flam = flam_vertex_matrix(process_flammables(flam, BOX))
+        mat_urb = urb_vertex_matrix(process_flammables(urb, BOX))
+        name = f"interface_K{K}_KF{KF}_limiar{round(limiar * 100)}_theta{limiartheta}_QT{QT}_{extraname}_{round(point.x0)}_y_{round(point.y0)}_d_{d}.csv"
+        names.append(name)
+        tasks.append((mat_urb, mat_flam, os.path.join(OUTPUT_FOLDER, name), dict(settings)))
+    # worker processes are forked: the main script cannot be re-imported by 'spawn'
+    if processes == 1 or len(tasks) <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        results = map(interface_of_point, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('fork'))
+        results = pool.map(interface_of_point, tasks)
+    rows = []
+    try:
+        for p, (point, name, result) in enumerate(zip(table.itertuples(), names, results), start=1):
+            rows.append({'name': point.name, 'X': point.X, 'Y': point.Y, 'x0': point.x0, 'y0': point.y0, 'd_box': point.d_box, **result, 'output': name})
+            print('point', p, 'out of', len(tasks), ':', point.name, '->', name)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    summary = pd.DataFrame(rows)
+    summary_path = os.path.join(OUTPUT_FOLDER, f"batch_K{K}_KF{KF}_limiar{round(limiar * 100)}_theta{limiartheta}_QT{QT}_{extraname}.csv")
+    summary.to_csv(summary_path, sep=',', index=False)
+    print(summary_path, f'({time.perf_counter() - start:.1f} s)')
+    return summary
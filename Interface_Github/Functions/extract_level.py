@@ -1,12 +1,74 @@
 ##############################################
     #    Library       #  
 ##############################################
+import numpy as np
 import pandas as pd
+import shapely
+
+##############################################
+    #    Columnar Extraction       #
+##############################################
+POLYGON_TYPE_IDS = (3, 6)  # shapely type ids of Polygon and MultiPolygon
+
+def extract_vertex_arrays(geodf):
+    """
+    Extract levels and coordinates from a GeoDataFrame in bulk, without a Python loop per vertex.
+
+    Input:
+    geodf (GeoDataFrame): Polygon / MultiPolygon geometries.
+
+    Output:
+    dict of NumPy arrays (one entry per vertex):
+        'x', 'y' : coordinates (float64)
+        'L1' : ring inside the polygon (1 = exterior, 2.. = holes) (int32)
+        'L2' : polygon inside the multipolygon ==> part (int32)
+        'L3' : feature, 1-based position of the row in geodf (int32)
+        'part' : dense id of the ring (L3, L2, L1), 1, 2, 3, ... in extraction order (int32)
+        'row' : 0-based position of the row in geodf, to broadcast feature attributes (int64)
+    """
+    geoms = np.asarray(geodf.geometry.values, dtype=object)
+    type_ids = shapely.get_type_id(geoms)
+    supported = np.isin(type_ids, POLYGON_TYPE_IDS)
+    for geom in geoms[~supported & (type_ids >= 0)]:
+        print(f"Unsupported geometry type: {geom.geom_type}")
+    rows = np.flatnonzero(supported)
+
+    # polygons of every feature (a Polygon is its own single part)
+    parts, part_row = shapely.get_parts(geoms[rows], return_index=True)
+    part_row = rows[part_row]
+    part_number = _position_in_group(part_row)
+
+    # exterior ring followed by the holes of every polygon
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    ring_number = _position_in_group(ring_part)
+
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+    coord_part = ring_part[coord_ring]
+    row = part_row[coord_part]
+    # factorized (L3, L2, L1): the vertices of a ring are consecutive, a new id starts with every ring
+    part = np.cumsum(np.r_[len(coord_ring) > 0, coord_ring[1:] != coord_ring[:-1]], dtype=np.int32)
+    return {
+        'x': coords[:, 0],
+        'y': coords[:, 1],
+        'L1': ring_number[coord_ring].astype(np.int32),
+        'L2': part_number[coord_part].astype(np.int32),
+        'L3': (row + 1).astype(np.int32),
+        'part': part,
+        'row': row,
+    }
+
+def _position_in_group(group):
+    """1-based position of every element inside its run of equal (sorted) group ids."""
+    if len(group) == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    run_lengths = np.diff(np.r_[starts, len(group)])
+    return np.arange(len(group)) - np.repeat(starts, run_lengths) + 1
 
 ##############################################
     #    Main Function       #  
 ##############################################
-def extract_vertices(geodf):
+def extract_vertices(geodf, columnar=True):
     """
     Extract levels and coordinates from a GeoDataFrame.
     
@@ -14,9 +76,23 @@ def extract_vertices(geodf):
     L1 identifies main rings or holes ==> outer polygon or hole
     L2 specifies the ring ID within a particular polygon of the multipolygon ==> part
     L3 distinguishes between different multipolygons ==> feature
+    part is the dense id (1, 2, 3, ...) of the ring (L3, L2, L1)
     
+    columnar=True pulls all vertices at once with extract_vertex_arrays;
+    columnar=False keeps the reference loop over features, parts, rings and coordinates.
+
     The output is a pandas dataFrame
     """
+    if columnar:
+        arrays = extract_vertex_arrays(geodf)
+        return pd.DataFrame({
+            'x': arrays['x'],
+            'y': arrays['y'],
+            'L1': arrays['L1'].astype(np.int64),
+            'L2': arrays['L2'].astype(np.int64),
+            'L3': arrays['L3'].astype(np.int64),
+            'part': arrays['part'].astype(np.int64),
+        })
     data = []
     for feature_index, geom in enumerate(geodf.geometry, start=1):  # Iterate over each geometry in the GeoDataFrame
         if geom is None:
@@ -46,5 +122,7 @@ def extract_vertices(geodf):
             print(f"Unsupported geometry type: {geom.geom_type}")
     
     df = pd.DataFrame(data, columns=['x', 'y', 'L1', 'L2', 'L3'])
+    # factorized (L3, L2, L1): a new part id starts with every ring
+    df['part'] = (df[['L1', 'L2', 'L3']].diff() != 0).any(axis=1).cumsum()
     return df
 
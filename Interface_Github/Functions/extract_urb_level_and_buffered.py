@@ -1,16 +1,36 @@
 ##############################################
     #    Main Library       #  
 ##############################################
+import numpy as np
 import pandas as pd
+from Functions.extract_level import extract_vertex_arrays
 ##############################################
     #    Main Function       #  
 ##############################################
-def extract_urb_vertices_and_buffered(geodf,col,value):
+def extract_urb_vertex_arrays(geodf, col, value):
+    """
+    Bulk version of extract_urb_vertices_and_buffered.
+
+    The 'buffered' flag is computed once per feature (geodf[col] == value)
+    and broadcast to the vertices of that feature.
+
+    Output:
+    dict of NumPy arrays: 'x', 'y' (float64), 'L1', 'L2', 'L3', 'part' (int32), 'buffered' (int8)
+    """
+    arrays = extract_vertex_arrays(geodf)
+    feature_buffered = (geodf[col].to_numpy() == value).astype(np.int8)
+    arrays['buffered'] = feature_buffered[arrays.pop('row')]
+    return arrays
+
+def extract_urb_vertices_and_buffered(geodf,col,value,columnar=True):
     """
     Extract levels and coordinates from a GeoDataFrame.
     
     The output is a pandas dataFrame, with an extra column 'buffered'.
+    With columnar=True the columns are typed: int32 levels and an int8 'buffered' flag.
     """
+    if columnar:
+        return pd.DataFrame(extract_urb_vertex_arrays(geodf, col, value))
     data = []
     for feature_index, (geom, layer) in enumerate(zip(geodf.geometry, geodf[col]), start=1):
         if geom is None:
@@ -40,4 +60,6 @@ def extract_urb_vertices_and_buffered(geodf,col,value):
             print(f"Unsupported geometry type: {geom.geom_type}")
     
     df = pd.DataFrame(data, columns=['x', 'y', 'L1', 'L2', 'L3', 'buffered'])
+    # factorized (L3, L2, L1): a new part id starts with every ring
+    df.insert(5, 'part', (df[['L1', 'L2', 'L3']].diff() != 0).any(axis=1).cumsum())
     return df
@@ -0,0 +1,308 @@
+##############################################
+    #    Libraries       #
+##############################################
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import numpy as np
+import pandas as pd
+
+##############################################
+    #    Import Functions       #
+##############################################
+from Functions.index import idxneigh
+from Functions.main_script_functions import get_neighbors, adjust_coordinates
+from Functions.nearest_neighbor_function import nearest_indices
+from Functions.decision import decision_fused, decision_batched, DecisionBuffers
+from Functions.azimuthVF_function import azimuthVF
+
+##############################################
+    #    Protectors       #
+##############################################
+RESULT_KEYS = ['interface', 'dF', 'azF', 'iF', 'azFplus', 'dFplus', 'idxF']  # arrays of compute_interface
+
+def protected_by_neighbors(mat_urb, nbr_idx, js, xV, yV, xF, yF, deciders, compact, pool=None, on_neighbor=None, batch=0):
+    """
+    Is V protected from F by at least one of its urban neighbors W (with the edges WW, WWW of W)?
+
+    Input:
+    mat_urb : urban vertex matrix (with idx_prev/idx_next)
+    nbr_idx (array n x KF): urban neighbors W (rows of mat_urb), one line per V
+    js (list): neighbor ranks to try (1 = closest)
+    xV, yV, xF, yF (arrays n): V and F
+    deciders (list): decide(xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW, out=...) functions,
+        one per thread (decision_fused, or decision_batched when batch > 0, with its constants and its own work arrays)
+    compact : the vertices already protected are left out of the next ranks
+    pool (ThreadPoolExecutor, optional): with several deciders, the ranks are shared by the
+        threads (thread t takes js[t::threads]) and their masks are OR-combined;
+        NumPy releases the GIL in the array arithmetic, so the threads run in parallel
+    on_neighbor (callable, optional): on_neighbor(j, xW, yW, xWW, yWW, xWWW, yWWW) after each rank
+        (progress messages, drawing), only without pool and batch
+    batch : if > 0, all the ranks js of a block of vertices are decided in one call (n x len(js) block
+        of at most batch (V, W) pairs, see decision_batched); the blocks are shared by the threads.
+        Fewer and larger NumPy calls, but no compact: every pair is decided
+
+    Output:
+    bool array n
+    """
+    if batch > 0:
+        n = len(xV)
+        protected = np.zeros(n, dtype=bool)
+        cols = np.asarray(js, dtype=np.intp) - 1
+        if len(cols) == 0:
+            return protected
+        block = max(1, batch // len(cols))
+        starts = range(0, n, block)
+        def decide_blocks(t):
+            threads = len(deciders)
+            for start in starts[t::threads]:
+                b = slice(start, start + block)
+                idx = nbr_idx[b][:, cols]
+                W = get_neighbors(mat_df=mat_urb, idx=idx.ravel(), idxneigh_func=idxneigh, in_type="urb", x_col='x', y_col='y', feat_col='idx_feat_urb')[:6]
+                deciders[t](xV[b], yV[b], xF[b], yF[b], *(a.reshape(idx.shape) for a in W), out=protected[b])
+        if pool is not None and len(deciders) > 1:
+            list(pool.map(decide_blocks, range(len(deciders))))
+        else:
+            decide_blocks(0)
+        return protected
+    if pool is not None and len(deciders) > 1:
+        threads = len(deciders)
+        masks = pool.map(lambda t: protected_by_neighbors(mat_urb, nbr_idx, js[t::threads], xV, yV, xF, yF, deciders[t:t+1], compact), range(threads))
+        return np.logical_or.reduce(list(masks))
+    decide = deciders[0]
+    n = len(xV)
+    protected = np.zeros(n, dtype=bool)
+    out = np.empty(n, dtype=bool)
+    active = np.arange(n)
+    for j in js:
+        if len(active) == 0:
+            break
+        xW, yW, xWW, yWW, xWWW, yWWW, _ = get_neighbors(mat_df=mat_urb, idx=nbr_idx[:, j-1], idxneigh_func=idxneigh, in_type="urb", x_col='x', y_col='y', feat_col='idx_feat_urb')
+        isprotected = decide(xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW, out=out[:len(active)])
+        if on_neighbor:
+            on_neighbor(j, xW, yW, xWW, yWW, xWWW, yWWW)
+        protected[active] |= isprotected
+        if compact:
+            keep = ~isprotected
+            active, xV, yV, xF, yF, nbr_idx = active[keep], xV[keep], yV[keep], xF[keep], yF[keep], nbr_idx[keep]
+    return protected
+
+##############################################
+    #    Main Algorithm       #
+##############################################
+def compute_interface(mat_urb, mat_flam, knn_idx, knn_dists, urb_tree, KS, KFS, KF, QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta,
+                      bigN, smallN, POSVALUE, NEGVALUE, workers=1, active_set=True, draw=None, TESTIDX=False,
+                      vrows=None, canonical_ties=True, verbose=True, threads=1, batch=0):
+    """
+    Main algorithm: is each urban vertex V protected from each of its K flammable neighbors F
+    (and from the closest points FF, FFF of the flammable edges of F) by the urban edges around it?
+
+    Input:
+    mat_urb, mat_flam (VertexStore or DataFrame): vertex matrices (row 0 = artifact point), with idx_prev/idx_next
+    knn_idx, knn_dists (arrays n x K): flammable neighbors of the urban vertices V and their (sorted) distances,
+        bigN when there is no neighbor within KDTREE_DIST_UPPERBOUND (artifact point)
+    urb_tree (VertexTree): KD-tree of mat_urb
+    KS, KFS (lists): flammable / urban neighbors to explore, KF = number of urban neighbors to search
+    QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, bigN, smallN, POSVALUE, NEGVALUE : constants
+    workers : threads of the KD-tree queries
+    active_set : in each (k, idxFviz) cycle, run get_neighbors and decision only on the vertices
+        whose result is still open (not yet protected, F not the artifact point, and still
+        protected from the previous F, FF, FFF); the result is identical.
+        Each k cycle also only keeps the vertices whose k-th flammable neighbor is not the
+        artifact point (the artifact is always protected, so it never changes the result)
+    draw (callable, optional): draw(mode, **kwargs) hook for full_plot_function; drawing needs
+        full-width arrays, so it disables active_set
+    TESTIDX : fewer progress messages
+    vrows (array, optional): rows of mat_urb that are the urban vertices V (default: all rows);
+        every row of mat_urb can still be a protector W (used by the tiled mode)
+    canonical_ties : order equidistant urban neighbors by index (see VertexTree.query_canonical); False (scipy order) gives another tie order than the tiled mode
+    verbose : progress messages
+    threads : threads sharing the KF protector loops of GROUP 1 and GROUP 2 (see protected_by_neighbors);
+        drawing needs the sequential loops
+    batch : if > 0, the KF protectors of each GROUP are decided together, in blocks of at most
+        batch (V, W) pairs (see protected_by_neighbors); drawing needs the loops over j
+
+    Output:
+    dict with 'interface', 'dF', 'azF', 'iF', 'azFplus', 'dFplus' (one value per urban vertex V)
+    and 'idxF' (flammable neighbor of the last k)
+
+    The k loop stops as soon as no urban vertex has a k-th flammable neighbor within
+    KDTREE_DIST_UPPERBOUND: every later neighbor is the artifact point.
+    """
+    xV = np.asarray(mat_urb['x'])
+    yV = np.asarray(mat_urb['y'])
+    if vrows is not None:
+        xV, yV = xV[vrows], yV[vrows]
+    n = len(xV)
+    not_interface = np.full(n, True)
+    dF = np.full(n, POSVALUE)
+    # Distance to farthest non-protected F
+    dFplus = np.full(n, NEGVALUE)
+    # Azimuth of the closest non-protected Flam (in degrees)
+    azF = np.full(n, NEGVALUE)
+    azFplus = np.full(n, NEGVALUE)
+    # Index of the closest non-protected Flam
+    iF = np.full(n, NEGVALUE)
+    # Determine KF urban neighbors W of urban V (GROUP 1 of potential protectors)
+    kvw_idx = nearest_indices(mat_urb, np.column_stack((xV, yV)), k=KF, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND, bigN=bigN, tree=urb_tree, workers=workers, as_frame=False, canonical_ties=canonical_ties)
+    compact = active_set and draw is None
+    # fused decision kernel with its work arrays (one set per thread), reused by every (k, idxFviz, j) cycle
+    threads = max(1, threads) if draw is None else 1
+    batch = batch if draw is None else 0
+    kernel = decision_batched if batch > 0 else decision_fused
+    capacity = min(max(batch, len(KFS)), n * len(KFS)) if batch > 0 else n
+    deciders = [partial(kernel, QT/100, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, smallN=smallN, bigN=bigN, buffers=DecisionBuffers(capacity))
+                for _ in range(threads)]
+    pool = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+    # flammable neighbor of the last k (knn_idx is 0 = artifact point beyond the early stop)
+    idxF = knn_idx[:, KS[-1]-1] if len(KS) > 0 else knn_idx[:, 0]
+    if len(KS) > 0:
+        # dF and azF become float at the first k; cycles may only update part of the vertices
+        dF = dF.astype(np.float64)
+        azF = azF.astype(np.float64)
+    # knn_dists is sorted: vertex i has flammable neighbors within D for k = 1..nvalid[i] only
+    nvalid = np.count_nonzero(knn_dists < bigN, axis=1)
+    for k in KS: # cycle through K FLAM neighbors of urban vertice
+        inrange = nvalid >= k
+        nactive = np.count_nonzero(inrange)
+        if verbose:
+            print('k', k, 'out of', len(KS),'flammable neighbors:', nactive, 'urban vertices still active')
+        if nactive == 0 and len(KFS) > 0:
+            if verbose:
+                print('no urban vertex has a flammable neighbor within', KDTREE_DIST_UPPERBOUND, 'm beyond k =', k - 1, ': stop')
+            break
+        # vertices of this k cycle: all of them, or (active set) those with a real k-th flammable neighbor
+        vk = np.flatnonzero(inrange) if compact and len(KFS) > 0 else slice(None)
+        xVk, yVk, kvw_k = xV[vk], yV[vk], kvw_idx[vk]
+        nk = len(xVk)
+        threetimesprotected = np.full(nk, True)
+        # the goal is to try to show that it is protected from its k-th flammable neighbor
+        idxFk = knn_idx[vk, k-1]
+        xF, yF, xFF, yFF, xFFF, yFFF, idxfeatF = get_neighbors(mat_df=mat_flam, idx=idxFk, idxneigh_func=idxneigh, in_type="flam", x_col='x', y_col='y', feat_col='idx_feat_flam')
+        if draw:
+            draw('plot_segments', xFF=xFF, xF=xF, xFFF=xFFF, yFF=yFF, yF=yF, yFFF=yFFF)
+        # Flamm point closest to xF,yF over the edge (F,FF) - next
+        xFF, yFF = adjust_coordinates(xF, yF, xFF, yFF, xVk, yVk)
+        # Flamm point closest to xF,yF over the edge (F,FFF) -- prev
+        xFFF, yFFF = adjust_coordinates(xF, yF, xFFF, yFFF, xVk, yVk)
+        xFback = xF
+        yFback = yF
+        if draw:
+            draw('plot_labels', xFback=xFback, yFback=yFback, xFF=xFF, xFFF=xFFF)
+        for idxFviz in range(1, 4):
+            if idxFviz == 2:
+                xF = xFF
+                yF = yFF
+            elif idxFviz == 3:
+                xF = xFFF
+                yF = yFFF
+            if verbose and not TESTIDX:
+                print(f"iteration {k} among F-neighbors and idxFviz={idxFviz} in 3")
+            # if idxfeatF isn't defined
+            xF = np.where(np.isnan(xF), bigN, xF)
+            yF = np.where(np.isnan(yF), bigN, yF)
+            idxfeatF = np.where(np.isnan(idxfeatF), NEGVALUE, idxfeatF)
+            if draw:
+                draw('plot_points', xFF=xFF, xF=xF, xFFF=xFFF, yFF=yFF, yF=yF, yFFF=yFFF, valid_idxF=idxFk, xFback=xFback, yFback=yFback, xV=xVk, yV=yVk, idxFviz=idxFviz)
+            protected = np.full(nk, False, dtype=bool) # Initialize protection status: it is not protected
+            if compact:
+                # the artifact point (no F within D) is protected by any W; vertices no longer
+                # threetimesprotected cannot change the result: only the others stay active
+                artifact = (xF == bigN) & (yF == bigN)
+                if len(KFS) > 0:
+                    protected[artifact] = True
+                rows = np.flatnonzero(threetimesprotected & ~artifact)
+                xVa, yVa, xFa, yFa = xVk[rows], yVk[rows], xF[rows], yF[rows]
+            else:
+                rows = slice(None)
+                xVa, yVa, xFa, yFa = xVk, yVk, xF, yF
+            def on_group1(j, xW, yW, xWW, yWW, xWWW, yWWW):
+                if verbose and j%20==0 and idxFviz==1 : print(j, 'out of', len(KFS), 'urban neighbors of V')
+                if verbose and not TESTIDX and j % 10 == 0:
+                    print(f"GROUP1: iteration {j} among urban neighbors of V")
+                if draw:
+                    draw('draw_points_g1', xW=xW, yW=yW, xWW=xWW, yWW=yWW, xWWW=xWWW, yWWW=yWWW, xF=xF, yF=yF, xV=xVk, yV=yVk)
+            def on_group2(j, xW, yW, xWW, yWW, xWWW, yWWW):
+                if verbose and j%20==0 and idxFviz==1 : print(j, 'out of', len(KFS), 'urban neighbors of Flam neighbors of V')
+                if verbose and not TESTIDX and j % 10 == 0:
+                    print(f"GROUP2: iteration {j} among urban neighbors of Flam neighbors of V")
+                if draw:
+                    draw('draw_points_g2', xW=xW, yW=yW, xWW=xWW, yWW=yWW, xWWW=xWWW, yWWW=yWWW, xF=xF, yF=yF, xV=xVk, yV=yVk)
+            # GROUP 1 of potential protectors:  KF Urban neighbors of urban vertices
+            # Dec 2018: moved outside  cycle GROUP 2: it should be k and not j, since kvw does not depend on the index of the flammable vertices
+            if not compact or len(rows) > 0:
+                isprotected1 = protected_by_neighbors(mat_urb, kvw_k[rows], KFS, xVa, yVa, xFa, yFa, deciders, compact, pool=pool, on_neighbor=on_group1, batch=batch)
+                protected[rows] |= isprotected1
+                if compact:
+                    keep = ~isprotected1
+                    rows, xVa, yVa, xFa, yFa = rows[keep], xVa[keep], yVa[keep], xFa[keep], yFa[keep]
+            # GROUP 2 of potential protectors: KF Urban neighbors of selected flammable vertices
+            # urban neighbors of selected flammable vertices (xF,yF)
+            if not compact or len(rows) > 0:
+                query = np.column_stack((xFa, yFa))
+                kfw_idx = nearest_indices(mat_urb, query, k=KF, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND, bigN=bigN, tree=urb_tree, workers=workers, as_frame=False, canonical_ties=canonical_ties)
+                isprotected2 = protected_by_neighbors(mat_urb, kfw_idx, KFS, xVa, yVa, xFa, yFa, deciders, compact, pool=pool, on_neighbor=on_group2, batch=batch)
+                protected[rows] |= isprotected2
+            if draw:
+                draw('draw_last_segments', protected=protected, xV=xVk, yV=yVk, xF=xF, yF=yF, idxFviz=idxFviz)
+
+            # set2019: define new variables d2VF, azVF and idxVF that are updated to depend on the closest neighbor among F,FF,FFF
+            # Calculate the current squared distance between V and F
+            d2VFcurrent = (xVk - xF)**2 + (yVk - yF)**2
+            azVFcurrent = azimuthVF(xV=xVk, yV=yVk, xF=xF, yF=yF)
+            idxVFcurrent = idxfeatF
+            if idxFviz == 1:
+                d2VF = d2VFcurrent
+                azVF = azVFcurrent
+                idxVF = idxVFcurrent
+            elif idxFviz > 1:
+                idxVF = (d2VFcurrent < d2VF) * idxVFcurrent + (d2VFcurrent >= d2VF) * idxVF
+                azVF = (d2VFcurrent < d2VF) * azVFcurrent + (d2VFcurrent >= d2VF) * azVF
+                d2VF = (d2VFcurrent < d2VF) * d2VFcurrent + (d2VFcurrent >= d2VF) * d2VF
+            threetimesprotected = threetimesprotected & protected
+        # notinterface will be FALSE if V is not protected from its k-th F-neighbor
+        # 28ago2019: do like dF to set indF from current idxfeatF, and azF from current azVF
+        iFk, azFk, dFk = iF[vk], azF[vk], dF[vk]
+        iF[vk] = (threetimesprotected * iFk) + \
+        (~threetimesprotected * ((d2VF < dFk**2) * idxVF + (d2VF >= dFk**2) * iFk))
+        azF[vk] = (threetimesprotected * azFk) + \
+        (~threetimesprotected * ((d2VF < dFk**2) * azVF + \
+                                            (d2VF >= dFk**2) * azFk))
+        dF[vk] = (threetimesprotected * dFk) + \
+        (~threetimesprotected * ((d2VF < dFk**2) * np.sqrt(d2VF) + \
+                                            (d2VF >= dFk**2) * dFk))
+        not_interface[vk] = not_interface[vk] & threetimesprotected
+    if pool is not None:
+        pool.shutdown()
+    interface = ~not_interface
+    interface[pd.isna(knn_idx[:, 0])] = False
+    return {'interface': interface, 'dF': dF, 'azF': azF, 'iF': iF, 'azFplus': azFplus, 'dFplus': dFplus, 'idxF': idxF}
+
+def compute_interface_chunked(mat_urb, mat_flam, urb_tree, flam_tree, CHUNK_SIZE, K, KS, KFS, KF, QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta,
+                              bigN, smallN, POSVALUE, NEGVALUE, writer, workers=1, active_set=True, TESTIDX=False, canonical_ties=True, threads=1, batch=0):
+    """
+    compute_interface over the urban vertices in chunks of CHUNK_SIZE rows (in mat_urb order): the (n, K)
+    flammable neighbor table and the (n, KF) urban neighbor tables only exist for one chunk at a time,
+    searched on the trees of the whole layers, and the results of each chunk go to writer.
+    Every urban vertex has the same neighbors as in a single compute_interface call: same result.
+
+    Input: as compute_interface, plus
+    flam_tree (VertexTree): KD-tree of mat_flam
+    CHUNK_SIZE (int): urban vertices per chunk
+    K : number of flammable neighbors to search
+    writer : receives writer.write(rows, result) for every chunk (see result_store.ResultWriter)
+
+    Output:
+    writer
+    """
+    rows = np.arange(len(mat_urb['x']))
+    chunks = [rows[start:start + CHUNK_SIZE] for start in range(0, len(rows), CHUNK_SIZE)]
+    xu, yu = np.asarray(mat_urb['x']), np.asarray(mat_urb['y'])
+    for c, vrows in enumerate(chunks, start=1):
+        knn_idx, knn_dists = nearest_indices(mat_flam, np.column_stack((xu[vrows], yu[vrows])), k=K, return_distance=True, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND,
+                                             bigN=bigN, tree=flam_tree, workers=workers, as_frame=False, canonical_ties=canonical_ties)
+        result = compute_interface(mat_urb, mat_flam, knn_idx, knn_dists, urb_tree, KS, KFS, KF, QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta,
+                                   bigN, smallN, POSVALUE, NEGVALUE, workers=workers, active_set=active_set, TESTIDX=TESTIDX, vrows=vrows,
+                                   canonical_ties=canonical_ties, verbose=False, threads=threads, batch=batch)
+        writer.write(vrows, result)
+        print('chunk', c, 'out of', len(chunks), ':', len(vrows), 'urban vertices')
+    return writer
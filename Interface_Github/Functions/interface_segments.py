@@ -0,0 +1,77 @@
+##############################################
+    #    Libraries       #
+##############################################
+import numpy as np
+from Functions.vertex_store import VertexStore
+from Functions.azimuthVF_function import azimuthVF
+
+##############################################
+    #    Interface Segments      #
+##############################################
+# variables of the output table, in order
+SEGMENT_VARS = ['idx_feat_u', 'x', 'y', 'idx_part_u', 'idx_vert_u', 'vert_type', 'idx_feat_f', 'dist_feat_f', 'd', 'az', 'iF', 'interface',
+                'linkL', 'linkR', 'lengthL', 'lengthR', 'segmentL', 'segmentR', 'azimuthL', 'azimuthR']
+
+def interface_points(xyd, POSVALUE, NEGVALUE):
+    """
+    Input:
+    xyd (VertexStore): one row per urban vertex (row 0 = artifact point), with the columns
+        'x','y','buffered','idx_part_u','idx_feat_u','idx_vert_u','vert_type','idx_feat_f','dist_feat_f','d','az','iF','interface'
+    POSVALUE, NEGVALUE : codes of the main script
+
+    Output:
+    VertexStore: original (not buffered) urban vertices sorted by idx_vert_u,
+    with d==POSVALUE and missing iF replaced by NEGVALUE
+    """
+    xyd = xyd.take(np.arange(1, len(xyd)))  # remove first row: artifact point x=bigN, y=bigN
+    xyd = xyd.take(xyd['buffered'] != 1)  # remove buffered vertices (jun 2025)
+    # sequential order of vertices, needed for the previous and following neighbors
+    xyd = xyd.take(np.argsort(xyd['idx_vert_u'], kind='stable'))
+    xyd['d'] = np.where(xyd['d'] == POSVALUE, NEGVALUE, xyd['d'])
+    xyd['iF'] = np.where(np.isnan(xyd['iF']), NEGVALUE, xyd['iF'])
+    return xyd
+
+def segment_table(xyd, NEGVALUE):
+    """
+    Input:
+    xyd (VertexStore): output of interface_points
+    NEGVALUE : code for "no value"
+
+    Output:
+    VertexStore with the SEGMENT_VARS columns, one row per vertex except the first and the last:
+    lengths and azimuths of the edges to the following (L) and previous (R) vertex,
+    links (0/1) and segment numbering along the interface
+    """
+    n = len(xyd)
+    mid = slice(1, n - 1)
+    nxt = slice(2, n)  # L : following vertex
+    prv = slice(0, max(n - 2, 0))  # R : previous vertex
+    x, y = xyd['x'], xyd['y']
+    part, vert, inter = xyd['idx_part_u'], xyd['idx_vert_u'], xyd['interface']
+    same_part_L = part[mid] == part[nxt]
+    same_part_R = part[mid] == part[prv]
+    # determine length of edges
+    lengthL = np.where(same_part_L, np.sqrt((x[nxt] - x[mid])**2 + (y[nxt] - y[mid])**2), NEGVALUE)
+    lengthR = np.where(same_part_R, np.sqrt((x[prv] - x[mid])**2 + (y[prv] - y[mid])**2), NEGVALUE)
+    # azimuth of segments
+    azimuthL = azimuthVF(x[mid], y[mid], x[nxt], y[nxt])
+    azimuthR = azimuthVF(x[mid], y[mid], x[prv], y[prv])
+    np.copyto(azimuthL, NEGVALUE, where=~same_part_L)
+    np.copyto(azimuthR, NEGVALUE, where=~same_part_R)
+    # determine when segments start/end: same part and successive vertex
+    linkL = (((inter[mid] | inter[nxt]) != 0) & same_part_L & (np.abs(vert[mid] - vert[nxt]) <= 1)).astype(np.int8)
+    linkR = (((inter[mid] | inter[prv]) != 0) & same_part_R & (np.abs(vert[mid] - vert[prv]) <= 1)).astype(np.int8)
+    # sequences 0/1 and segment numbering (the missing step of the last/first row counts as 0)
+    steplinkL = np.append(np.diff(linkL.astype(np.int64)), 0)
+    segmentL = np.cumsum((steplinkL >= 0) * steplinkL)
+    steplinkR = np.insert(np.diff(linkR.astype(np.int64)), 0, 0)
+    segmentR = 1 + np.cumsum((steplinkR <= 0) * np.abs(steplinkR))
+    # remove segment numbers when not interface
+    segmentR = np.where((inter[mid] == 0) & (inter[prv] == 0), NEGVALUE, segmentR)
+    segmentL = np.where((inter[mid] == 0) & (inter[nxt] == 0), NEGVALUE, segmentL)
+    table = xyd.take(mid)
+    table['linkL'], table['linkR'] = linkL, linkR
+    table['lengthL'], table['lengthR'] = lengthL, lengthR
+    table['segmentL'], table['segmentR'] = segmentL, segmentR
+    table['azimuthL'], table['azimuthR'] = azimuthL, azimuthR
+    return table.select(SEGMENT_VARS)
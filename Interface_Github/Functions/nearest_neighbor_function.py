@@ -1,7 +1,7 @@
 ##############################################
     #    Libraries       #  
 ##############################################
-from scipy.spatial import KDTree
+from scipy.spatial import cKDTree
 import datatable as dt
 import pandas as pd 
 import numpy as np
@@ -10,18 +10,86 @@ import numpy as np
 ##############################################
     #    Nearest Neighbor      #  
 ##############################################
-def nearest_indices(A: dt.Frame, B: dt.Frame= None, k=1, return_distance=False,KDTREE_DIST_UPPERBOUND=1000,bigN=10**6) -> pd.DataFrame:
-    A = A[:, ['x', 'y']]
-    B = B[:, ['x', 'y']] if B is not None else A
-    tree = KDTree(A)
-    dist, idx = tree.query(B, k=k, distance_upper_bound=KDTREE_DIST_UPPERBOUND)
-    MyInvalidIndex = 0  # or any value you prefer # Define an index to represent 'invalid' results (when no neighbor is within the distance bound)
-    idx[idx == tree.n] = MyInvalidIndex 
-    idx = pd.DataFrame(idx, columns=[f"neighbor_{i+1}" for i in range(k)])
-    if return_distance:
-        dist[dist == np.inf] = bigN
-        dist = pd.DataFrame(dist, columns=[f"distance_{i+1}" for i in range(k)])
-        return idx, dist
-    else:
-        return idx
+def xy_array(A) -> np.ndarray:
+    """(n, 2) float array with the 'x' and 'y' columns of a dt.Frame, a pandas DataFrame or an (n, 2) array."""
+    if isinstance(A, np.ndarray):
+        return A
+    if isinstance(A, dt.Frame):
+        return A[:, ['x', 'y']].to_numpy()
+    return np.column_stack((np.asarray(A['x']), np.asarray(A['y'])))
 
+
+class VertexTree:
+    """
+    KD-tree over the x/y vertices of a vertex matrix.
+
+    Build it once per matrix (mat_urb, mat_flam) and query it many times;
+    nearest_indices builds a throw-away one when no tree is given.
+    leafsize=10 matches scipy's KDTree default, so neighbour order is unchanged.
+    compact_dtypes=True makes every query return int32 indices and float32 distances
+    (half the memory of the (n, k) tables; same neighbors).
+    """
+    def __init__(self, A, leafsize=10, balanced_tree=True, compact_nodes=True, compact_dtypes=False):
+        self.tree = cKDTree(xy_array(A), leafsize=leafsize, balanced_tree=balanced_tree, compact_nodes=compact_nodes)
+        self.n = self.tree.n
+        self.compact_dtypes = compact_dtypes and self.n < np.iinfo(np.int32).max
+
+    def query(self, B, k=1, return_distance=False, KDTREE_DIST_UPPERBOUND=1000, bigN=10**6, workers=1, as_frame=True, canonical_ties=True):
+        # workers > 1 (or -1 for all cores) splits the query points over threads in scipy
+        # as_frame=False returns the raw (n, k) NumPy arrays instead of DataFrames (k=[1] keeps 2-D for k=1)
+        # canonical_ties=True (default) orders equidistant neighbors by index (see query_canonical): same neighbors in any tree over the same points
+        if canonical_ties:
+            dist, idx = self.query_canonical(xy_array(B), k, KDTREE_DIST_UPPERBOUND, workers)
+        else:
+            dist, idx = self.tree.query(xy_array(B), k=k if k > 1 else [1], distance_upper_bound=KDTREE_DIST_UPPERBOUND, workers=workers)
+        MyInvalidIndex = 0  # or any value you prefer # Define an index to represent 'invalid' results (when no neighbor is within the distance bound)
+        idx[idx == self.n] = MyInvalidIndex 
+        if self.compact_dtypes:
+            idx = idx.astype(np.int32)
+        if as_frame:
+            idx = pd.DataFrame(idx, columns=[f"neighbor_{i+1}" for i in range(k)])
+        if return_distance:
+            dist[dist == np.inf] = bigN
+            if self.compact_dtypes:
+                dist = dist.astype(np.float32) # only compared with bigN (exact in float32) and written out
+            if as_frame:
+                dist = pd.DataFrame(dist, columns=[f"distance_{i+1}" for i in range(k)])
+            return idx, dist
+        else:
+            return idx
+
+    def query_canonical(self, pts, k, distance_upper_bound, workers=1):
+        """
+        k nearest neighbors sorted by (distance, index), so that equidistant neighbors
+        (frequent with rounded coordinates) come in the same order whatever the tree, and the
+        tie at the k-th neighbor is broken the same way. Two trees over the same points near
+        pts (e.g. a whole layer and a tile of it) then return the same neighbors.
+        Rows whose (k+1)-th neighbor ties with the k-th are queried again with more neighbors.
+        """
+        dist, idx = self.tree.query(pts, k=k + 1, distance_upper_bound=distance_upper_bound, workers=workers)
+        rows = np.flatnonzero(np.isfinite(dist[:, k-1]) & (dist[:, k] == dist[:, k-1]))
+        dist, idx = _first_k_by_distance_and_index(dist, idx, k)
+        kk = k + 1
+        while len(rows) > 0:
+            kk = min(2 * kk, self.n + 1)
+            dist_r, idx_r = self.tree.query(pts[rows], k=kk, distance_upper_bound=distance_upper_bound, workers=workers)
+            done = (kk > self.n) | ~(np.isfinite(dist_r[:, k-1]) & (dist_r[:, -1] == dist_r[:, k-1]))
+            dist[rows[done]], idx[rows[done]] = _first_k_by_distance_and_index(dist_r[done], idx_r[done], k)
+            rows = rows[~done]
+        return dist, idx
+
+
+def _first_k_by_distance_and_index(dist, idx, k):
+    order = np.lexsort((idx, dist), axis=-1)[:, :k]
+    return np.take_along_axis(dist, order, axis=-1), np.take_along_axis(idx, order, axis=-1)
+
+
+def nearest_indices(A: dt.Frame, B: dt.Frame= None, k=1, return_distance=False,KDTREE_DIST_UPPERBOUND=1000,bigN=10**6, tree=None, workers=1, as_frame=True, canonical_ties=True) -> pd.DataFrame:
+    """
+    k nearest vertices of A for every vertex of B (of A itself when B is None).
+    Pass tree=VertexTree(A) to reuse an already built tree, workers=-1 to query on all cores,
+    as_frame=False to get NumPy arrays. Equidistant neighbors are ordered by index (canonical_ties=False: in scipy order).
+    """
+    tree = tree if tree is not None else VertexTree(A)
+    B = B if B is not None else A
+    return tree.query(B, k=k, return_distance=return_distance, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND, bigN=bigN, workers=workers, as_frame=as_frame, canonical_ties=canonical_ties)
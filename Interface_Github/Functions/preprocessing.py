@@ -3,6 +3,7 @@
 ##############################################
 from shapely.geometry import MultiPolygon,box
 import numpy as np
+from Functions.vertex_store import VertexStore
 
 
 ##############################################
@@ -33,9 +34,12 @@ def process_flammables(flam, BOX):
     """
     # Create the bounding box polygon
     bounding_polygon = box(BOX["xmin"], BOX["ymin"], BOX["xmax"], BOX["ymax"])
-    # Explode all MultiPolygons into individual Polygons (preserves topology)
-    exploded = flam.explode(index_parts=False)#[1]
-    # Select only the Polygons that intersect the bounding box
+    # Features that intersect the bounding box: STRtree lookup of the envelopes, then the exact predicate
+    # (sorted, to keep the order of the layer)
+    selected = np.sort(flam.sindex.query(bounding_polygon, predicate="intersects"))
+    # Explode the selected MultiPolygons into individual Polygons (preserves topology)
+    exploded = flam.iloc[selected].explode(index_parts=False)#[1]
+    # Select only the Polygons that intersect the bounding box (a selected feature can have parts outside)
     intersects = exploded.intersects(bounding_polygon)
     result = exploded[intersects].copy()
     # If you want to group back into MultiPolygons (optional, may not be needed)
@@ -45,16 +49,35 @@ def process_flammables(flam, BOX):
     return result
 
 # Removes duplicate
-def clean_and_reindex(df, part_col, vert_col):
+def clean_and_reindex(df, part_col, vert_col, consecutive=True):
     """
     Input:
-    df (pd.DataFrame): DataFrame containing spatial data.
+    df (pd.DataFrame or VertexStore): DataFrame containing spatial data.
     part_col (str):  (e.g., 'idx_part_flam' or 'idx_part_urb').
     vert_col (str):  (e.g., 'idx_vert_flam' or 'idx_vert_urb').
+    consecutive (bool): True removes the vertices that repeat their neighbour in the part (same x, y:
+        one pass over shifted arrays, no hashing, see kept_vertices); False keeps the former rule, rows
+        duplicated anywhere in the table (all columns). Both give the same table on closed rings that
+        only repeat consecutive vertices; a ring that comes back to an earlier vertex keeps it with True.
 
     Output:
-    pd.DataFrame: Processed DataFrame with duplicates removed and the vertex column reindexed.
+    pd.DataFrame (or VertexStore): Processed DataFrame with duplicates removed and the vertex column reindexed.
     """
+    if consecutive:
+        keep = kept_vertices(np.asarray(df['x']), np.asarray(df['y']), np.asarray(df[part_col]))
+        if isinstance(df, VertexStore):
+            df = df.take(keep)
+            df[vert_col] = np.arange(1, len(df) + 1)
+            return df
+        df = df.loc[keep].copy()
+        df.loc[:, vert_col] = np.arange(1, len(df) + 1)
+        return df
+    if isinstance(df, VertexStore):
+        dups = duplicated_rows([df[name] for name in df.names])
+        step = np.append(np.diff(df[part_col]) != 0, False)
+        df = df.take(~(dups & ~step))
+        df[vert_col] = np.arange(1, len(df) + 1)
+        return df
     dups = df.duplicated() 
     step = np.append(np.diff(df[part_col].values) != 0, False)  
     df = df.loc[~(dups & ~step)].copy()  
@@ -63,6 +86,45 @@ def clean_and_reindex(df, part_col, vert_col):
 
     return df  
 
+# Rows kept by the consecutive pass of clean_and_reindex
+def kept_vertices(x, y, part):
+    """
+    Input:
+    x, y, part (arrays): vertices in ring order, the rows of each part contiguous
+
+    Output:
+    bool array: False for the vertices that repeat their neighbour in the part. In a run of equal
+    consecutive vertices the first one is kept, or only the last one when the run ends on the
+    closing vertex of the part; as the former rule, the closing vertex of the last part of the
+    table is dropped, with the vertices equal to it, when it repeats the first vertex of its part.
+    Same rows as the former rule (duplicated() and last vertex of every part) on closed rings that
+    only repeat consecutive vertices
+    """
+    n = len(part)
+    same_prev = np.zeros(n, dtype=bool)
+    same_prev[1:] = (part[1:] == part[:-1]) & (x[1:] == x[:-1]) & (y[1:] == y[:-1])
+    same_next = np.append(same_prev[1:], False)
+    closing = np.append(part[1:] != part[:-1], False)  # last vertex of its part, except the last row of the table
+    run = np.cumsum(~same_prev) - 1  # runs of equal consecutive vertices
+    keep = np.where(closing[~same_next][run], ~same_next, ~same_prev)
+    keep[1:] |= part[1:] != part[:-1]  # first vertex of its part (a ring of one repeated point keeps it, with its closing vertex)
+    if n > 1:
+        first = n - np.argmax(part[::-1] != part[-1]) if part[0] != part[-1] else 0  # first row of the last part
+        if run[first] != run[-1] and x[first] == x[-1] and y[first] == y[-1]:
+            keep[run == run[-1]] = False
+    return keep
+
+# Same as DataFrame.duplicated() (keep='first') over a list of columns, without hashing rows
+def duplicated_rows(columns):
+    order = np.lexsort(columns[::-1])  # stable: equal rows keep their original order
+    same_as_previous = np.ones(len(order) - 1 if len(order) else 0, dtype=bool)
+    for values in columns:
+        sorted_values = values[order]
+        same_as_previous &= sorted_values[1:] == sorted_values[:-1]
+    dups = np.zeros(len(order), dtype=bool)
+    dups[order[1:][same_as_previous]] = True
+    return dups
+
 def insert_zero_at_the_beginning_of_1D_array(arr):
     return np.insert(arr, 0, 0)
     
@@ -0,0 +1,111 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import json
+import time
+import shutil
+import numpy as np
+
+##############################################
+    #    Import Functions       #
+##############################################
+from Functions.vertex_store import VertexStore
+from Functions.interface_engine import RESULT_KEYS
+
+##############################################
+    #    Result Store      #
+##############################################
+# A result folder holds one .npy file per array of the main algorithm (VertexStore.save)
+# and a manifest.json with every parameter of the run: reloading maps the arrays
+# (no unpickling, no copy) and only accepts results computed with the same parameters.
+
+def jsonable(params):
+    """params as they read back from JSON (NumPy scalars -> Python numbers, tuples -> lists)."""
+    return json.loads(json.dumps(params, default=lambda v: v.item() if isinstance(v, np.generic) else str(v)))
+
+def save_results(folder, result, params):
+    """
+    Input:
+    folder (str): result folder (replaced if it exists)
+    result (dict): arrays of compute_interface (RESULT_KEYS)
+    params (dict): parameters of the run
+    """
+    tmp = folder + f".tmp{os.getpid()}"
+    shutil.rmtree(tmp, ignore_errors=True)
+    VertexStore({key: result[key] for key in RESULT_KEYS}).save(tmp)
+    # the manifest is written last: a folder without it is incomplete
+    with open(os.path.join(tmp, "manifest.json"), "w") as f:
+        json.dump({'params': jsonable(params), 'created': time.time()}, f, indent=1)
+    shutil.rmtree(folder, ignore_errors=True)
+    os.replace(tmp, folder)
+
+def load_results(folder, params=None, mmap_mode='r'):
+    """
+    Input:
+    folder (str): result folder written by save_results
+    params (dict, optional): parameters of the current run
+    mmap_mode : see numpy.load ('r' = read-only memory map, None = read into memory)
+
+    Output:
+    VertexStore with the RESULT_KEYS arrays, or None when the folder is incomplete
+    or was computed with other parameters
+    """
+    manifest_path = os.path.join(folder, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if params is not None and manifest['params'] != jsonable(params):
+        changed = sorted(name for name in set(manifest['params']) | set(jsonable(params))
+                         if manifest['params'].get(name) != jsonable(params).get(name))
+        print(folder, 'was computed with other parameters:', changed)
+        return None
+    try:
+        return VertexStore.load(folder, mmap_mode=mmap_mode)
+    except (OSError, ValueError):
+        return None
+
+class ResultWriter:
+    """
+    Result folder written chunk by chunk: the RESULT_KEYS arrays are memory-mapped .npy files
+    (same layout as save_results), filled as the chunks of urban vertices are computed.
+    With folder=None the arrays are kept in memory.
+
+    writer = ResultWriter(folder, n)
+    writer.write(rows, result)   -> results of the urban vertices rows (arrays of compute_interface)
+    writer.close(params)         -> writes the manifest; VertexStore of the results (memory-mapped)
+    """
+    def __init__(self, folder, n):
+        self.folder = folder
+        self.n = n
+        self.tmp = None if folder is None else folder + f".tmp{os.getpid()}"
+        self.arrays = {}
+        if self.tmp is not None:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+            os.makedirs(self.tmp)
+
+    def write(self, rows, result):
+        for key in RESULT_KEYS:
+            if key not in self.arrays:
+                # the first chunk gives the dtype of every array
+                if self.tmp is None:
+                    self.arrays[key] = np.empty(self.n, dtype=result[key].dtype)
+                else:
+                    self.arrays[key] = np.lib.format.open_memmap(os.path.join(self.tmp, f"{key}.npy"), mode='w+', dtype=result[key].dtype, shape=(self.n,))
+            self.arrays[key][rows] = result[key]
+
+    def close(self, params=None):
+        if self.tmp is None:
+            return VertexStore(self.arrays)
+        for values in self.arrays.values():
+            values.flush()
+        self.arrays = {}
+        with open(os.path.join(self.tmp, "columns.json"), "w") as f:
+            json.dump(RESULT_KEYS, f)
+        # the manifest is written last: a folder without it is incomplete
+        with open(os.path.join(self.tmp, "manifest.json"), "w") as f:
+            json.dump({'params': jsonable(params), 'created': time.time()}, f, indent=1)
+        shutil.rmtree(self.folder, ignore_errors=True)
+        os.replace(self.tmp, self.folder)
+        return VertexStore.load(self.folder, mmap_mode='r')
@@ -0,0 +1,153 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import json
+import time
+import shutil
+import hashlib
+import numpy as np
+
+##############################################
+    #    Import Functions       #
+##############################################
+from Functions.vertex_store import VertexStore
+
+##############################################
+    #    Vertex Cache      #
+##############################################
+CACHE_VERSION = 5  # bump when the content of the vertex matrices changes
+
+def layer_files(path):
+    """All the files of a layer: path itself and, for a shapefile, its sidecar files (.dbf, .shx, .prj, ...)."""
+    folder, name = os.path.split(os.path.abspath(path))
+    stem = os.path.splitext(name)[0]
+    files = [os.path.join(folder, f) for f in os.listdir(folder) if os.path.splitext(f)[0] == stem]
+    return sorted(files) if files else [path]
+
+def file_signature(path, content_hash=False):
+    """
+    Input:
+    path (str): input layer
+    content_hash (bool): sha1 of the bytes of every file instead of their size and modification time
+
+    Output:
+    list of [file name, signature] for the files of the layer
+    """
+    signature = []
+    for file in layer_files(path):
+        if content_hash:
+            digest = hashlib.sha1()
+            with open(file, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            signature.append([os.path.basename(file), digest.hexdigest()])
+        else:
+            st = os.stat(file)
+            signature.append([os.path.basename(file), st.st_size, st.st_mtime_ns])
+    return signature
+
+def vertex_cache_key(paths, content_hash=False, **params):
+    """
+    Input:
+    paths (list): input layers
+    content_hash (bool): see file_signature
+    params : settings the cached arrays depend on (option, d_box, x0, y0, KDTREE_DIST_UPPERBOUND, ...)
+
+    Output:
+    (key, description): sha1 hex key and the JSON-able description it was computed from
+    """
+    description = {'version': CACHE_VERSION,
+                   'files': [file_signature(path, content_hash) for path in paths],
+                   'params': {name: (value.item() if isinstance(value, np.generic) else value) for name, value in sorted(params.items())}}
+    key = hashlib.sha1(json.dumps(description, sort_keys=True).encode()).hexdigest()
+    return key, description
+
+class VertexCache:
+    """
+    On-disk cache of the results of the Reading Part (vertex matrices, neighbor tables).
+
+    One folder per key, with one .npy file per column (VertexStore.save) or per array and a
+    manifest.json. The manifest modification time is the last use: when the folder grows
+    beyond max_bytes, the least recently used entries are removed.
+
+    cache.load(key)               -> dict name -> VertexStore / array, or None
+    cache.save(key, items, about) -> writes the entry, then evicts
+    """
+    def __init__(self, folder, max_bytes):
+        self.folder = folder
+        self.max_bytes = max_bytes
+
+    def entry(self, key):
+        return os.path.join(self.folder, key)
+
+    def load(self, key, mmap_mode=None):
+        manifest_path = os.path.join(self.entry(key), "manifest.json")
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            items = {}
+            for name, kind in manifest['items'].items():
+                path = os.path.join(self.entry(key), name)
+                if kind == 'store':
+                    items[name] = VertexStore.load(path, mmap_mode=mmap_mode)
+                else:
+                    items[name] = np.load(path + ".npy", mmap_mode=mmap_mode, allow_pickle=False)
+        except (OSError, ValueError, KeyError):
+            # incomplete or stale entry: computed again and overwritten
+            return None
+        os.utime(manifest_path)  # last use
+        return items
+
+    def save(self, key, items, about=None):
+        """
+        Input:
+        key (str): see vertex_cache_key
+        items (dict): name -> VertexStore or NumPy array
+        about (dict, optional): description written to the manifest
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        tmp = self.entry(key) + f".tmp{os.getpid()}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        kinds = {}
+        for name, value in items.items():
+            if isinstance(value, VertexStore):
+                value.save(os.path.join(tmp, name))
+                kinds[name] = 'store'
+            else:
+                np.save(os.path.join(tmp, name + ".npy"), np.asarray(value), allow_pickle=False)
+                kinds[name] = 'array'
+        # the manifest is written last: an entry without it is incomplete
+        with open(os.path.join(tmp, "manifest.json"), "w") as f:
+            json.dump({'key': key, 'items': kinds, 'created': time.time(), 'about': about}, f)
+        shutil.rmtree(self.entry(key), ignore_errors=True)
+        os.replace(tmp, self.entry(key))
+        self.evict(keep=key)
+
+    def entries(self):
+        """(last use, size in bytes, key) of every complete entry."""
+        if not os.path.isdir(self.folder):
+            return []
+        found = []
+        for key in os.listdir(self.folder):
+            manifest_path = os.path.join(self.entry(key), "manifest.json")
+            if not os.path.exists(manifest_path):
+                continue
+            size = sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(self.entry(key)) for f in files)
+            found.append((os.path.getmtime(manifest_path), size, key))
+        return found
+
+    def evict(self, keep=None):
+        """Removes the least recently used entries (except keep) until the cache fits in max_bytes."""
+        found = sorted(self.entries())
+        total = sum(size for _, size, _ in found)
+        for _, size, key in found:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.entry(key), ignore_errors=True)
+            total -= size
@@ -0,0 +1,114 @@
+##############################################
+    #    Libraries       #
+##############################################
+import numpy as np
+
+##############################################
+    #    Import Functions       #
+##############################################
+from Functions.vertex_store import VertexStore
+from Functions.extract_level import extract_vertex_arrays
+from Functions.extract_urb_level_and_buffered import extract_urb_vertex_arrays
+from Functions.preprocessing import clean_and_reindex, insert_zero_at_the_beginning_of_1D_array, insert_bigN_at_the_beginning_of_1D_array
+from Functions.index import add_prev_next_columns
+from Functions.nearest_neighbor_function import VertexTree, nearest_indices
+
+##############################################
+    #    Vertex Matrices      #
+##############################################
+# Reading Part of the main script: vertex matrices of the flammable and urban layers
+# (row 0 = artifact point x=bigN, y=bigN) and the nearest vertex of the other layer.
+
+def part_ids(xy, n_features):
+    """
+    Input:
+    xy (dict): vertex arrays of extract_vertex_arrays / extract_urb_vertex_arrays
+    n_features (int): number of features of the layer
+
+    Output:
+    array: id of the part (ring L1 of polygon L2 of feature L3) of every vertex, dense int32 1, 2, 3, ...
+    (exact at any size, unlike the former M*Q*L3 + M*L1 + L2 encoding); 0 is kept for the artifact point
+    """
+    if 'L3' not in xy or xy['L3'].max() != n_features:
+        raise ValueError("L3 is not properly indexed")
+    return xy['part']
+
+def flam_vertex_matrix(flam):
+    """
+    Input:
+    flam (GeoDataFrame): flammable (Multi)Polygons
+
+    Output:
+    VertexStore mat_flam: x, y, idx_feat_flam, idx_part_flam, idx_vert_flam, idx_prev, idx_next
+    (duplicates removed, row 0 = artifact point)
+    """
+    xy_flam = extract_vertex_arrays(flam) # NumPy columns, no intermediate DataFrame
+    idx_part_flam = part_ids(xy_flam, len(flam))
+    # june 2025: o create an artifial point (idx=0)  x=bigN, y=bigN. In neighbor search, when there is no eneighbor within search distance, the neighbor will be idx=0
+    mat_flam = VertexStore({
+        'x': insert_bigN_at_the_beginning_of_1D_array(np.round(xy_flam['x'])),
+        'y': insert_bigN_at_the_beginning_of_1D_array(np.round(xy_flam['y'])),
+        'idx_feat_flam': insert_zero_at_the_beginning_of_1D_array(xy_flam['L3']),
+        'idx_part_flam':  insert_zero_at_the_beginning_of_1D_array(idx_part_flam)
+    })
+    mat_flam = clean_and_reindex(mat_flam,"idx_part_flam","idx_vert_flam") # Remove duplicates
+    return add_prev_next_columns(mat_flam, "flam") # prev/next vertex of each vertex, computed once
+
+def urb_vertex_matrix(urb):
+    """
+    Input:
+    urb (GeoDataFrame): urban polygons and their negative buffers ('layer'="Buffered")
+
+    Output:
+    VertexStore mat_urb: x, y, idx_feat_urb, idx_part_urb, buffered, idx_vert_urb, idx_prev, idx_next
+    (duplicates removed, row 0 = artifact point)
+    """
+    xy_urb=extract_urb_vertex_arrays(urb,col='layer',value='Buffered') # returns also column "buffered" to distinguish original and "Buffered" vertices
+    idx_part_urb = part_ids(xy_urb, len(urb))
+    mat_urb = VertexStore({
+        'x': insert_bigN_at_the_beginning_of_1D_array(np.round(xy_urb['x'])),
+        'y': insert_bigN_at_the_beginning_of_1D_array(np.round(xy_urb['y'])),
+        'idx_feat_urb': insert_zero_at_the_beginning_of_1D_array(xy_urb['L3']),
+        'idx_part_urb': insert_zero_at_the_beginning_of_1D_array(idx_part_urb),
+        'buffered': insert_zero_at_the_beginning_of_1D_array(xy_urb['buffered'])
+    })
+    # idx_vert_urb takes values 1,2,3,.... AFTER removal of duplicates
+    mat_urb=clean_and_reindex(mat_urb,"idx_part_urb","idx_vert_urb") # Remove duplicates
+    return add_prev_next_columns(mat_urb, "urb") # prev/next vertex of each vertex, computed once
+
+def compact_vertex_matrix(mat):
+    """
+    Input:
+    mat (VertexStore): vertex matrix
+
+    Output:
+    mat with int32 row / vertex indices (idx_vert_*, idx_prev, idx_next); coordinates (float64, used by
+    the decisions) are kept, feature and part ids are already int32 from the extraction. Unchanged beyond 2**31 rows.
+    """
+    if len(mat) < np.iinfo(np.int32).max:
+        for name in mat.names:
+            if (name.startswith('idx_vert_') or name in ('idx_prev', 'idx_next')) and mat[name].dtype.itemsize > 4:
+                mat[name] = mat[name].astype(np.int32)
+    return mat
+
+def link_layers(mat_urb, mat_flam, KDTREE_DIST_UPPERBOUND, bigN, balanced_tree=True, compact_nodes=True, workers=1, compact_dtypes=False):
+    """
+    Input:
+    mat_urb, mat_flam (VertexStore): vertex matrices (urb_vertex_matrix, flam_vertex_matrix)
+    KDTREE_DIST_UPPERBOUND, bigN : constants
+    balanced_tree, compact_nodes, workers : KD-tree options (see VertexTree)
+    compact_dtypes : int32 indices in the matrices (compact_vertex_matrix) and int32 / float32 neighbor tables from the trees
+
+    Output:
+    (urb_tree, flam_tree): KD-trees of the two matrices, built once and reused by every neighbour search;
+    adds mat_flam['idx_vert_urb'] (nearest urban vertex) and mat_urb['idx_vert_flam'] (nearest flammable vertex)
+    """
+    if compact_dtypes:
+        compact_vertex_matrix(mat_urb)
+        compact_vertex_matrix(mat_flam)
+    urb_tree = VertexTree(mat_urb, balanced_tree=balanced_tree, compact_nodes=compact_nodes, compact_dtypes=compact_dtypes)
+    flam_tree = VertexTree(mat_flam, balanced_tree=balanced_tree, compact_nodes=compact_nodes, compact_dtypes=compact_dtypes)
+    # search nearest flammable neighbor
+    mat_flam['idx_vert_urb'] = nearest_indices(mat_urb,mat_flam,k=1,KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND,bigN=bigN,tree=urb_tree,workers=workers,as_frame=False) # urban vertices of flam vertices
+    mat_urb['idx_vert_flam'] = nearest_indices(mat_flam,mat_urb,k=1,KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND,bigN=bigN,tree=flam_tree,workers=workers,as_frame=False) # Flammable neighbors of urban vertices
+    return urb_tree, flam_tree
@@ -0,0 +1,82 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import json
+import numpy as np
+import pandas as pd
+
+##############################################
+    #    Vertex Store      #
+##############################################
+class VertexStore:
+    """
+    Columnar table backed by NumPy arrays: one 1-D array per column, all of the same length.
+
+    It replaces the pandas -> datatable -> pandas round-trips of the main script:
+    the vertex matrices (mat_urb, mat_flam) and the output table are built, searched
+    and read column by column without copies or Python objects.
+
+    store['x']            -> the NumPy array of column 'x' (no copy)
+    store['x'] = values   -> add / replace a column
+    store.take(rows)      -> new store with the selected rows (positions or boolean mask)
+    store.to_pandas()     -> pandas DataFrame (for plotting and CSV export)
+    store.save(folder)    -> one .npy file per column (VertexStore.load(folder) reads it back)
+    """
+    def __init__(self, columns=None):
+        self.columns = {}
+        for name, values in (columns or {}).items():
+            self[name] = values
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(next(iter(self.columns.values())))
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __setitem__(self, name, values):
+        values = np.asarray(values).reshape(-1)
+        if self.columns and len(values) != len(self):
+            raise ValueError(f"column '{name}' has {len(values)} rows, the store has {len(self)}")
+        self.columns[name] = values
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values())
+
+    def take(self, rows):
+        return VertexStore({name: values[rows] for name, values in self.columns.items()})
+
+    def select(self, names):
+        return VertexStore({name: self.columns[name] for name in names})
+
+    def to_pandas(self):
+        return pd.DataFrame(self.columns)
+
+    @classmethod
+    def from_pandas(cls, df):
+        return cls({name: df[name].to_numpy() for name in df.columns})
+
+    def save(self, folder):
+        """Writes every column to folder/<name>.npy, and the column order to folder/columns.json."""
+        os.makedirs(folder, exist_ok=True)
+        for name, values in self.columns.items():
+            np.save(os.path.join(folder, f"{name}.npy"), values, allow_pickle=False)
+        with open(os.path.join(folder, "columns.json"), "w") as f:
+            json.dump(self.names, f)
+
+    @classmethod
+    def load(cls, folder, mmap_mode=None):
+        """Store written by save (mmap_mode='r' maps the columns instead of reading them)."""
+        with open(os.path.join(folder, "columns.json")) as f:
+            names = json.load(f)
+        return cls({name: np.load(os.path.join(folder, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False) for name in names})
@@ -0,0 +1,68 @@
+##############################################
+    #    Libraries       #
+##############################################
+import os
+import sys
+
+############################################################################################
+    #    This is related to get functions from Functions directory     #
+############################################################################################
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add the parent directory to sys.path
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+##############################################
+    #    Files call     #
+##############################################
+from constants import *
+from Functions.Get_directory import get_project_directories
+from Functions.batch_points import compute_interfaces_batch
+
+##############################################
+    #    Set directory     #
+##############################################
+INPUT_FOLDER, OUTPUT_FOLDER = get_project_directories()
+option = "altorisco"  # Choose between "altorisco" (high-risk) or "todos" (all areas)
+if option == "altorisco":
+    inputFlamm = "high_risk_sintra.shp"  # High-risk combustible areas
+    extraname = "test-AR2019"
+elif option == "todos":
+    inputFlamm = "all_risk_sintra.shp"  # All combustible areas
+    extraname = "test-All2019"
+
+urban_file = "urban_sintra.shp"  # Buffered Urban area file. Atributo 'layer'="Buffered" indica ods polígonos do buffer negativo
+
+flammable_path = os.path.join(INPUT_FOLDER, inputFlamm)  # Full path to flammable file
+urban_path = os.path.join(INPUT_FOLDER, urban_file)  # Full path to urban file
+
+##############################################
+    #    Test Points     #  coordinate system : 'EPSG:3763'
+##############################################
+# Each point gives the same output as Main.py with TESTIDX at that point (X,Y, d_box)
+# (X, Y) or (X, Y, d_box); BATCH_POINTS (CSV) replaces this list
+POINTS = [
+    (-97403.9, -101304.0),
+    (-97337.8, -101021.2),
+    (-101429.975, -92435.477),
+    (-101416.832, -92411.277), # exemplo Aziza
+    (-101380, -92395), # exemplo Aziza, ao lado
+    (-101296.8, -92594.3),
+    (-101352.3, -92686.7),
+    (-107141.963, -92168.828), # Figure_1
+    (-107110.014, -92262.408), # Figure 2
+    (-100556.002, -93329.993), # exemplo segmento com um vertice
+    (-97885.426, -88204.763), # outro local em Sintra
+]
+
+##############################################
+    #    Batch     #
+##############################################
+summary = compute_interfaces_batch(BATCH_POINTS if BATCH_POINTS is not None else POINTS, flammable_path, urban_path, OUTPUT_FOLDER, extraname, d_box,
+                                   K, KS, KFS, KF, QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta, bigN, smallN, POSVALUE, NEGVALUE,
+                                   processes=BATCH_PROCESSES, workers=KDTREE_WORKERS, active_set=ACTIVE_SET,
+                                   threads=DECISION_THREADS, batch=DECISION_BATCH, balanced_tree=KDTREE_BALANCED_TREE,
+                                   compact_nodes=KDTREE_COMPACT_NODES, compact_dtypes=COMPACT_DTYPES, use_arrow=READ_USE_ARROW)
+print(summary.to_string(index=False))
@@ -1,4 +1,12 @@
 KDTREE_DIST_UPPERBOUND = 500 # Maximum distance for KDTree search
+KDTREE_BALANCED_TREE = True # KDTree build option: False (sliding midpoint) builds faster on large layers
+KDTREE_COMPACT_NODES = True # KDTree build option: shrink nodes to the data (faster queries, slower build)
+KDTREE_WORKERS = 1 # Threads used by the KDTree queries (-1 = all cores)
+COMPACT_DTYPES = False # int32 vertex indices and neighbor tables, float32 neighbor distances: half the memory of the (N, K) tables, same result
+READ_USE_ARROW = True # Read the layers with the Arrow transport of pyogrio (needs pyarrow)
+VERTEX_CACHE = True # Reuse the vertex matrices and neighbor tables of a previous run (same input files, option, d_box, point, K, KDTREE_DIST_UPPERBOUND and KD-tree options): skips the Reading Part
+VERTEX_CACHE_MAX_MB = 2000 # Size limit of Output/vertex_cache (least recently used entries are removed)
+VERTEX_CACHE_HASH = False # Identify the input files by content (sha1) instead of size and modification time
 d_box= 1000 # defines BOX around central point to filter data (urb and flam) and create plots 
 K = 60 # Number of flammable neighbors to explore
 KF =60 # Number of urban neighbors of the flammable neighbors to explore 
@@ -7,6 +15,14 @@ limiartheta = 60  # Largest angle to be eligible to protect
 QT = 5 # minimum contribution of one side to the triangle perimeter (%)
 KS = list(range(1, K + 1)) # Flammable neighbors range
 KFS = list(range(1, KF + 1))  # Urban neighbors range
+ACTIVE_SET = True # Main algorithm only evaluates the urban vertices still unresolved (same result, faster); drawing uses all vertices
+TILE_SIZE = 0 # If 0 one process; else side (m) of the tiles computed in parallel processes (several times KDTREE_DIST_UPPERBOUND)
+TILE_PROCESSES = None # Processes of the tiled mode (None = all cores)
+CHUNK_SIZE = 0 # If >0 the main algorithm runs over chunks of CHUNK_SIZE urban vertices (memory bounded by the chunk, same result); not with TILE_SIZE or drawing
+DECISION_THREADS = 1 # Threads sharing the KF protector loops of the main algorithm (1 = no threads; drawing uses 1)
+DECISION_BATCH = 0 # If >0 the KF protectors are decided together, in blocks of at most DECISION_BATCH (V, W) pairs (bounds memory); 0 = one call per protector
+BATCH_POINTS = None # Main_batch.py: CSV of test points (columns X, Y and optionally d_box, name); None = the points listed in Main_batch.py
+BATCH_PROCESSES = None # Main_batch.py: processes sharing the points (None = all cores)
 MAXDIST = 0  # If 0 do not densify #to densify: maximum distance in meters between urban vertices
 tolerance = 3 # Distance tolerance
 bigN = 10**6  # large number (larger than 3763 coordinates over Portugal)
@@ -0,0 +1,65 @@
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Polygon
+import os, sys
+
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add the parent directory to sys.path
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from Functions.vertex_store import VertexStore
+from Functions.extract_urb_level_and_buffered import extract_urb_vertex_arrays
+from Functions.preprocessing import clean_and_reindex, insert_zero_at_the_beginning_of_1D_array, insert_bigN_at_the_beginning_of_1D_array
+
+# The consecutive pass of clean_and_reindex must give the same table as the former duplicated() rule: every line must print True
+
+# closed rings rounded to metres with repeated consecutive vertices (up to 3 copies of each vertex) and, in
+# half of them, copies of the first vertex before the closing vertex; vertices 5 m or more apart otherwise
+rng = np.random.default_rng(2025)
+def ring(x, y, r, q):
+    angles = np.sort(rng.uniform(0, 2 * np.pi, q))
+    angles = angles[np.append(True, np.diff(angles) > 5 / r)]
+    coords = np.round(np.column_stack((x + r * np.cos(angles), y + r * np.sin(angles))))
+    coords = np.repeat(coords, rng.integers(1, 4, len(coords)), axis=0)
+    if rng.random() < 0.5:
+        coords = np.vstack((coords, np.repeat(coords[:1], rng.integers(1, 3), axis=0)))
+    return Polygon(coords)
+rings = [ring(x, y, r, q) for x, y, r, q in zip(rng.uniform(0, 2000, 300), rng.uniform(0, 2000, 300), rng.uniform(20, 60, 300), rng.integers(4, 30, 300))]
+# and rings of one repeated point (polygons smaller than a metre)
+rings += [Polygon([(x, y)] * int(q)) for x, y, q in zip(np.round(rng.uniform(0, 2000, 20)), np.round(rng.uniform(0, 2000, 20)), rng.integers(4, 7, 20))]
+rings = list(rng.permutation(np.array(rings, dtype=object)))
+urb = gpd.GeoDataFrame({'layer': rng.choice(['Original', 'Buffered'], len(rings))}, geometry=rings)
+
+xy = extract_urb_vertex_arrays(urb, col='layer', value='Buffered')
+mat_urb = VertexStore({
+    'x': insert_bigN_at_the_beginning_of_1D_array(np.round(xy['x'])),
+    'y': insert_bigN_at_the_beginning_of_1D_array(np.round(xy['y'])),
+    'idx_feat_urb': insert_zero_at_the_beginning_of_1D_array(xy['L3']),
+    'idx_part_urb': insert_zero_at_the_beginning_of_1D_array(xy['part']),
+    'buffered': insert_zero_at_the_beginning_of_1D_array(xy['buffered'])
+})
+
+def same(a, b):
+    return len(a) == len(b) and all(np.array_equal(np.asarray(a[name]), np.asarray(b[name])) for name in a.names)
+
+new, old = clean_and_reindex(mat_urb, 'idx_part_urb', 'idx_vert_urb'), clean_and_reindex(mat_urb, 'idx_part_urb', 'idx_vert_urb', consecutive=False)
+print('vertices:', len(mat_urb), '->', len(new))
+# same table (VertexStore)
+print(same(new, old))
+# same table (DataFrame)
+df = mat_urb.to_pandas()
+print(clean_and_reindex(df, 'idx_part_urb', 'idx_vert_urb').equals(clean_and_reindex(df, 'idx_part_urb', 'idx_vert_urb', consecutive=False)))
+# no zero-length edge left, except in the rings of one point
+x, y, part = new['x'], new['y'], new['idx_part_urb']
+point = np.bincount(part)[part] == 2
+print(not np.any((part[1:] == part[:-1]) & (x[1:] == x[:-1]) & (y[1:] == y[:-1]) & ~point[1:]))
+# same table on every prefix of rings (last row of the table: closing vertex of any ring)
+ends = np.flatnonzero(np.diff(mat_urb['idx_part_urb'])) + 1
+print(all(same(clean_and_reindex(mat_urb.take(np.arange(end)), 'idx_part_urb', 'idx_vert_urb'),
+               clean_and_reindex(mat_urb.take(np.arange(end)), 'idx_part_urb', 'idx_vert_urb', consecutive=False)) for end in ends))
+# a ring that comes back to an earlier vertex (spike) keeps it: one more vertex than with the former rule
+spike = VertexStore({'x': np.array([0., 10, 10, 10, 0, 0]), 'y': np.array([0., 0, 10, 0, 10, 0]), 'idx_part_urb': np.ones(6, dtype=int)})
+print(len(clean_and_reindex(spike, 'idx_part_urb', 'idx_vert_urb')) == len(clean_and_reindex(spike, 'idx_part_urb', 'idx_vert_urb', consecutive=False)) + 1)
@@ -0,0 +1,67 @@
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Polygon
+import os, sys
+
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add the parent directory to sys.path
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from constants import *
+from Functions.vertex_matrices import flam_vertex_matrix, urb_vertex_matrix, link_layers
+from Functions.nearest_neighbor_function import nearest_indices
+from Functions.interface_engine import compute_interface, compute_interface_chunked, RESULT_KEYS
+from Functions.interface_tiles import compute_interface_tiled
+from Functions.result_store import ResultWriter
+
+# COMPACT_DTYPES must give the same interface as the default dtypes: every line must print True
+
+# synthetic layers: jittered urban blocks (and their negative buffers) among jittered flammable patches,
+# coordinates rounded to metres as in the main script (many equidistant neighbors)
+rng = np.random.default_rng(2025)
+def jittered_square(x, y, side):
+    corners = np.array([[x, y], [x + side, y], [x + side, y + side], [x, y + side]], dtype=float)
+    return Polygon(np.round(corners + rng.uniform(-4, 4, corners.shape)))
+blocks = [jittered_square(60 * i, 60 * j, 30) for i in range(15) for j in range(15)]
+urb = gpd.GeoDataFrame({'layer': ['Original'] * len(blocks) + ['Buffered'] * len(blocks)},
+                       geometry=blocks + [block.buffer(-3, join_style=2) for block in blocks])
+flam = gpd.GeoDataFrame(geometry=[jittered_square(60 * i + 35, 60 * j + 35, 18) for i in range(15) for j in range(15) if (i + j) % 3])
+
+K, KF = 10, 10
+KS, KFS = list(range(1, K + 1)), list(range(1, KF + 1))
+D = 100
+
+def interface_of(compact_dtypes, canonical_ties=True):
+    mat_urb, mat_flam = urb_vertex_matrix(urb), flam_vertex_matrix(flam)
+    urb_tree, flam_tree = link_layers(mat_urb, mat_flam, D, bigN, compact_dtypes=compact_dtypes)
+    knn_idx, knn_dists = nearest_indices(mat_flam, mat_urb, k=K, return_distance=True, KDTREE_DIST_UPPERBOUND=D, bigN=bigN, tree=flam_tree,
+                                         as_frame=False, canonical_ties=canonical_ties)
+    result = compute_interface(mat_urb, mat_flam, knn_idx, knn_dists, urb_tree, KS, KFS, KF, QT, D, limiar, limiartheta,
+                               bigN, smallN, POSVALUE, NEGVALUE, canonical_ties=canonical_ties, verbose=False)
+    return mat_urb, mat_flam, urb_tree, flam_tree, knn_idx, knn_dists, result
+
+def same(a, b):
+    return all(np.array_equal(a[key], b[key]) for key in RESULT_KEYS)
+
+mat_urb, mat_flam, urb_tree, flam_tree, knn_idx, knn_dists, result = interface_of(False)
+mat_urb_c, mat_flam_c, urb_tree_c, flam_tree_c, knn_idx_c, knn_dists_c, result_c = interface_of(True)
+print('interface vertices:', np.count_nonzero(result['interface']), 'of', len(mat_urb) - 1)
+# compact dtypes
+print(knn_idx_c.dtype == np.int32, knn_dists_c.dtype == np.float32, mat_urb_c['idx_prev'].dtype == np.int32)
+# same neighbors, same distances (to float32 precision), same matrices
+print(np.array_equal(knn_idx, knn_idx_c), np.allclose(knn_dists, knn_dists_c, rtol=1e-6),
+      all(np.array_equal(mat_urb[name], mat_urb_c[name]) for name in mat_urb.names))
+# same interface
+print(same(result, result_c))
+# same interface with the scipy order of equidistant neighbors, in tiles and in chunks
+print(same(interface_of(False, False)[-1], interface_of(True, False)[-1]))
+tiled = compute_interface_tiled(mat_urb_c, mat_flam_c, 300, 1, K, KS, KFS, KF, QT, D, limiar, limiartheta, bigN, smallN, POSVALUE, NEGVALUE, compact_dtypes=True)
+print(same(tiled, result))
+chunked = compute_interface_chunked(mat_urb_c, mat_flam_c, urb_tree_c, flam_tree_c, 1000, K, KS, KFS, KF, QT, D, limiar, limiartheta,
+                                    bigN, smallN, POSVALUE, NEGVALUE, ResultWriter(None, len(mat_urb_c))).close()
+print(same(chunked, result))
+# memory of the (N, K) tables
+print('neighbor tables:', (knn_idx.nbytes + knn_dists.nbytes) // 1024, 'KB ->', (knn_idx_c.nbytes + knn_dists_c.nbytes) // 1024, 'KB')
@@ -26,4 +26,8 @@ xWWW=np.array([5,5,5,5,5,5,5,5,5])
 yWWW=np.array([3,8,13,3,8,13,3,8,13])
 
 # Q should be a parameter
-print(decision(QT,KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW, verbose=False, log_file="decision_table_test.csv"))
\ No newline at end of file
+print(decision(QT,KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW, verbose=False, log_file="decision_table_test.csv"))
+# fused kernel: must print the same decisions
+print(decision_fused(QT,KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW))
+# batched kernel (one protector per V): must print the same decisions
+print(decision_batched(QT,KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, xW[:, None], yW[:, None], xWW[:, None], yWW[:, None], xWWW[:, None], yWWW[:, None]))
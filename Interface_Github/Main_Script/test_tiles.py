@@ -0,0 +1,55 @@
+import numpy as np
+import geopandas as gpd
+from shapely.geometry import Polygon
+import os, sys
+
+# Get the absolute path of the parent directory (Interface_Github)
+parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Add the parent directory to sys.path
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+from constants import *
+from Functions.vertex_matrices import flam_vertex_matrix, urb_vertex_matrix, link_layers
+from Functions.nearest_neighbor_function import nearest_indices
+from Functions.interface_engine import compute_interface, RESULT_KEYS
+from Functions.interface_tiles import compute_interface_tiled
+
+# The tiled mode (TILE_SIZE > 0) must give the same interface as the default single-process run: every line must print True
+
+# synthetic layers on a regular grid: square urban blocks (and their negative buffers) among square flammable patches,
+# half of them jittered, coordinates rounded to metres as in the main script (many equidistant neighbors)
+rng = np.random.default_rng(2025)
+def square(x, y, side, jitter):
+    corners = np.array([[x, y], [x + side, y], [x + side, y + side], [x, y + side]], dtype=float)
+    return Polygon(np.round(corners + jitter * rng.uniform(-4, 4, corners.shape)))
+blocks = [square(50 * i, 50 * j, 30, (i * j) % 2) for i in range(16) for j in range(16)]
+urb = gpd.GeoDataFrame({'layer': ['Original'] * len(blocks) + ['Buffered'] * len(blocks)},
+                       geometry=blocks + [block.buffer(-3, join_style=2) for block in blocks])
+flam = gpd.GeoDataFrame(geometry=[square(50 * i + 35, 50 * j + 35, 10, (i + j) % 2) for i in range(16) for j in range(16) if (i + j) % 3])
+
+K, KF = 10, 10
+KS, KFS = list(range(1, K + 1)), list(range(1, KF + 1))
+D = 100
+
+def same(a, b):
+    return all(np.array_equal(a[key], b[key]) for key in RESULT_KEYS)
+
+# default single-process run, as in Main.py with TILE_SIZE = 0
+mat_urb, mat_flam = urb_vertex_matrix(urb), flam_vertex_matrix(flam)
+urb_tree, flam_tree = link_layers(mat_urb, mat_flam, D, bigN)
+knn_idx, knn_dists = nearest_indices(mat_flam, mat_urb, k=K, return_distance=True, KDTREE_DIST_UPPERBOUND=D, bigN=bigN, tree=flam_tree, as_frame=False)
+result = compute_interface(mat_urb, mat_flam, knn_idx, knn_dists, urb_tree, KS, KFS, KF, QT, D, limiar, limiartheta,
+                           bigN, smallN, POSVALUE, NEGVALUE, verbose=False)
+print('interface vertices:', np.count_nonzero(result['interface']), 'of', len(mat_urb) - 1)
+# same interface in tiles of several sizes, in one process and in a process pool
+for TILE_SIZE, TILE_PROCESSES in ((250, 1), (400, 1), (250, 4)):
+    tiled = compute_interface_tiled(mat_urb, mat_flam, TILE_SIZE, TILE_PROCESSES, K, KS, KFS, KF, QT, D, limiar, limiartheta,
+                                    bigN, smallN, POSVALUE, NEGVALUE)
+    print(same(tiled, result))
+# the scipy order of equidistant neighbors (canonical_ties=False) gives another interface on this grid
+knn_idx_s, knn_dists_s = nearest_indices(mat_flam, mat_urb, k=K, return_distance=True, KDTREE_DIST_UPPERBOUND=D, bigN=bigN, tree=flam_tree,
+                                         as_frame=False, canonical_ties=False)
+print(not same(compute_interface(mat_urb, mat_flam, knn_idx_s, knn_dists_s, urb_tree, KS, KFS, KF, QT, D, limiar, limiartheta,
+                                 bigN, smallN, POSVALUE, NEGVALUE, canonical_ties=False, verbose=False), result))
@@ -1,31 +1,94 @@
 ##############################################
-    #    Libraries       #  
+    #    Library     #
 ##############################################
-from shapely.ops import nearest_points
-from shapely.geometry import Point
-import geopandas as gpd
+import numpy as np
 import pandas as pd
+import geopandas as gpd
+import shapely
+from .read_layer import read_layer
+
+SNAP_WINDOW = 1000  # half side (m) of the window of the urban layer read around the points
+
 ##############################################
-    #    Main Function       #  
+    #    Functions       #
 ##############################################
-def convert_xy(X, Y, urban_path):
-    # Load the urban geometries
-    urb = gpd.read_file(urban_path)
+def snap_to_boundaries(urb, X, Y):
+    """
+    Input:
+    urb (GeoDataFrame): urban polygons
+    X, Y (arrays): points, in the CRS of urb
 
-    # Create a Point object from input coordinates
-    target_point = Point(X, Y)
+    Output:
+    X, Y, distance (arrays): closest point of the polygon boundaries to each point (NaN if urb is empty);
+    among equally close boundaries, the first one in urb (as idxmin of the distances)
+    """
+    points = np.asarray(gpd.points_from_xy(X, Y))
+    boundaries = np.asarray(urb.geometry.boundary.values)
+    Xs, Ys, dist = np.full(len(points), np.nan), np.full(len(points), np.nan), np.full(len(points), np.nan)
+    # STRtree nearest search: every boundary at the minimum distance of each point
+    ipoint, ibound = gpd.GeoSeries(boundaries).sindex.nearest(points, return_all=True)
+    if len(ipoint) == 0:
+        return Xs, Ys, dist
+    order = np.lexsort((ibound, ipoint))
+    ipoint, ibound = ipoint[order], ibound[order]
+    first = np.r_[True, ipoint[1:] != ipoint[:-1]]
+    ipoint, ibound = ipoint[first], ibound[first]
+    # nearest_points(boundary, point)[0]: start of the shortest line from the boundary to the point
+    start = shapely.get_coordinates(shapely.shortest_line(boundaries[ibound], points[ipoint])).reshape(-1, 2, 2)[:, 0]
+    Xs[ipoint], Ys[ipoint] = start[:, 0], start[:, 1]
+    dist[ipoint] = shapely.distance(boundaries[ibound], points[ipoint])
+    return Xs, Ys, dist
 
-    # Create a GeoSeries of polygon boundaries
-    boundaries = urb.geometry.boundary
-
-    # Compute distances to the target point
-    distances = boundaries.distance(target_point)
+##############################################
+    #    Main Function       #
+##############################################
+def convert_xy(X, Y, urban_path, urb=None, window=SNAP_WINDOW):
+    """
+    Input:
+    X, Y (floats or arrays): points (EPSG:3763, the CRS of the urban layer); arrays snap many points at once
+    urban_path (str): urban layer, only read around the points (when urb is not given)
+    urb (GeoDataFrame, optional): urban layer already read, around the points with a margin of at least window
+        (or the whole layer, with window=None)
+    window (float or None): half side (m) of the window read around the points; the points farther than
+        window from every urban boundary of the window are snapped on the whole layer (None = whole layer)
 
-    # Get the geometry with the minimum distance
-    min_idx = distances.idxmin()
+    Output:
+    DataFrame with columns X, Y: closest point of the urban polygon boundaries, one row per point
+    """
+    X, Y = np.atleast_1d(X).astype(float), np.atleast_1d(Y).astype(float)
+    if urb is None:
+        BOX = {'xmin': X.min(), 'xmax': X.max(), 'ymin': Y.min(), 'ymax': Y.max()} if window is not None else None
+        urb = read_layer(urban_path, BOX, margin=window, columns=[])
+    Xs, Ys, dist = snap_to_boundaries(urb, X, Y)
+    if window is not None:
+        # the features outside the window are farther than window from every point
+        far = ~(dist <= window)
+        if far.any():
+            Xs[far], Ys[far], _ = snap_to_boundaries(read_layer(urban_path, columns=[]), X[far], Y[far])
+    return pd.DataFrame({'X': Xs, 'Y': Ys})
 
-    # Compute the nearest point on the boundary
-    nearest_pt = nearest_points(boundaries[min_idx], target_point)[0]
+def read_urban_and_snap(X, Y, urban_path, d_box, margin, columns=None, use_arrow=False, window=SNAP_WINDOW):
+    """
+    Input:
+    X, Y (floats or arrays): points (EPSG:3763, the CRS of the urban layer)
+    urban_path (str): urban layer
+    d_box (float, array or None): half side (m) of the box around each snapped point (None = whole layer)
+    margin (float): margin (m) read around the boxes (KDTREE_DIST_UPPERBOUND)
+    columns, use_arrow : see read_layer
+    window (float): see convert_xy
 
-    # Return as a DataFrame
-    return pd.DataFrame([{'X': nearest_pt.x, 'Y': nearest_pt.y}])
\ No newline at end of file
+    Output:
+    (x0y0, urb): closest point of the urban polygon boundaries to each point (convert_xy) and the urban
+    layer read once to find it, covering the boxes around x0y0 plus margin (snapped points are at most window
+    away); urb is None when a point was snapped on the whole layer (farther than window): read the boxes then
+    """
+    X, Y = np.atleast_1d(X).astype(float), np.atleast_1d(Y).astype(float)
+    if d_box is None:
+        urb = read_layer(urban_path, columns=columns, use_arrow=use_arrow)
+        return convert_xy(X, Y, urban_path, urb=urb, window=None), urb
+    BOX = {'xmin': (X - d_box).min(), 'xmax': (X + d_box).max(), 'ymin': (Y - d_box).min(), 'ymax': (Y + d_box).max()}
+    urb = read_layer(urban_path, BOX, margin=margin + window, columns=columns, use_arrow=use_arrow)
+    x0y0 = convert_xy(X, Y, urban_path, urb=urb, window=window)
+    if np.any(np.maximum(np.abs(x0y0['X'].values - X), np.abs(x0y0['Y'].values - Y)) > window):
+        urb = None
+    return x0y0, urb
@@ -117,4 +117,190 @@ def decision(Q,KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, xW,
         })
         table.to_csv(log_file, index=False)
         if verbose:
-            print(f"Results logged to {log_file}")
\ No newline at end of file
+            print(f"Results logged to {log_file}")
+
+
+##############################################
+    #    Fused Decision Kernel     #  
+##############################################
+
+class DecisionBuffers:
+    """
+    Work arrays of decision_fused, allocated once for inputs of length up to n and reused by every call
+    (one per cycle of the main loop instead of ~40 temporary arrays per call).
+    dtype follows the inputs, so the arithmetic is the one of decision.
+    """
+    NFLOAT = 24  # 10 gathered inputs + 14 intermediates
+    def __init__(self, n, dtype=np.float64):
+        self.n = n
+        self.dtype = np.dtype(dtype)
+        self.num = np.empty((self.NFLOAT, n), dtype=self.dtype)
+        self.mask = np.empty((4, n), dtype=bool)
+        self.rows = np.empty(n, dtype=np.intp)
+
+# same result as decision, bit for bit
+def decision_fused(Q,KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW,smallN,bigN, out=None, buffers=None):
+    """
+    Fused version of decision: every cross product / distance is computed once,
+    rows already decided by the artifact point (F = (bigN, bigN)) are skipped,
+    and the square roots and the arccos are only evaluated on the few rows that
+    pass all the cheap conditions.
+
+    Input: same as decision, plus
+    out (bool array, optional): output buffer of length n
+    buffers (DecisionBuffers, optional): work arrays reused between calls (capacity >= n)
+
+    Output:
+    bool array (out): is V protected from F by (WWW,W,WW)?
+    """
+    inputs = (xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW)
+    n = len(xV)
+    dtype = np.result_type(*inputs)
+    if buffers is None or buffers.n < n or buffers.dtype != dtype:
+        buffers = DecisionBuffers(n, dtype)
+    if out is None:
+        out = np.empty(n, dtype=bool)
+    num, mask = buffers.num[:, :n], buffers.mask[:, :n]
+
+    # condition_artifact decides the row (True) whatever the other conditions
+    np.equal(xF, bigN, out=out)
+    np.equal(yF, bigN, out=mask[0])
+    np.logical_and(out, mask[0], out=out)
+    np.logical_not(out, out=mask[0])
+    m = np.count_nonzero(mask[0])
+    if m == 0:
+        return out
+    if m == n:
+        xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW = inputs
+    else:
+        rows = buffers.rows[:m]
+        rows[:] = np.flatnonzero(mask[0])
+        xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW = [np.take(a, rows, out=num[i, :m]) for i, a in enumerate(inputs)]
+    b = [mask[i, :m] for i in range(1, 4)]
+    t = [num[i, :m] for i in range(10, buffers.NFLOAT)]
+    dxVF, dyVF, dxVW, dyVW, d2VF, d2VW, d2WF, dot, cVFW, c1, c2, tmp, tmp2, tmp3 = t
+
+    # Distance calculations (shared differences)
+    np.subtract(xF, xV, out=dxVF)
+    np.subtract(yF, yV, out=dyVF)
+    np.subtract(xW, xV, out=dxVW)
+    np.subtract(yW, yV, out=dyVW)
+    np.multiply(dxVF, dxVF, out=d2VF)
+    np.multiply(dyVF, dyVF, out=tmp)
+    np.add(d2VF, tmp, out=d2VF)
+    np.multiply(dxVW, dxVW, out=d2VW)
+    np.multiply(dyVW, dyVW, out=tmp)
+    np.add(d2VW, tmp, out=d2VW)
+    np.subtract(xW, xF, out=tmp)
+    np.multiply(tmp, tmp, out=d2WF)
+    np.subtract(yW, yF, out=tmp)
+    np.multiply(tmp, tmp, out=tmp)
+    np.add(d2WF, tmp, out=d2WF)
+    np.multiply(dxVW, dxVF, out=dot)
+    np.multiply(dyVW, dyVF, out=tmp)
+    np.add(dot, tmp, out=dot)
+
+    # crossprod(xV,yV,xF,yF,xV,yV,xW,yW): shared by protedge_next and protedge_prev
+    np.multiply(dxVF, dyVW, out=cVFW)
+    np.multiply(dyVF, dxVW, out=tmp)
+    np.subtract(cVFW, tmp, out=cVFW)
+
+    # protedge_next (edge W-WW) then protedge_prev (edge W-WWW), OR-ed into b[0]
+    b[0][:] = False
+    for xE, yE in ((xWW, yWW), (xWWW, yWWW)):
+        # crossprod(xW,yW,xE,yE,xW,yW,xF,yF) -> c1, crossprod(xW,yW,xE,yE,xW,yW,xV,yV) -> c2
+        np.subtract(xE, xW, out=tmp2)
+        np.subtract(yE, yW, out=tmp3)
+        np.subtract(yF, yW, out=c1)
+        np.multiply(tmp2, c1, out=c1)
+        np.subtract(xF, xW, out=tmp)
+        np.multiply(tmp3, tmp, out=tmp)
+        np.subtract(c1, tmp, out=c1)
+        np.subtract(yV, yW, out=c2)
+        np.multiply(tmp2, c2, out=c2)
+        np.subtract(xV, xW, out=tmp)
+        np.multiply(tmp3, tmp, out=tmp)
+        np.subtract(c2, tmp, out=c2)
+        np.multiply(c1, c2, out=c2)
+        np.less(c2, -smallN, out=b[1])
+        np.abs(c1, out=c1)
+        np.less_equal(c1, smallN, out=b[2])
+        np.logical_or(b[1], b[2], out=b[1])
+        # crossprod(xV,yV,xF,yF,xV,yV,xE,yE) -> c1
+        np.subtract(yE, yV, out=c1)
+        np.multiply(dxVF, c1, out=c1)
+        np.subtract(xE, xV, out=tmp)
+        np.multiply(dyVF, tmp, out=tmp)
+        np.subtract(c1, tmp, out=c1)
+        np.multiply(cVFW, c1, out=c1)
+        np.less(c1, -smallN, out=b[2])
+        np.logical_and(b[1], b[2], out=b[1])
+        np.logical_or(b[0], b[1], out=b[0])
+
+    # cheap conditions first: inside region, positive (hence valid) distances, closer urban,
+    # and dot**2 <= d2VW * d2VF (otherwise thetaV = limiartheta and the angle condition fails)
+    np.less_equal(d2VF, 2 * KDTREE_DIST_UPPERBOUND**2, out=b[1])
+    np.greater(d2VW, 0, out=b[2])
+    np.logical_and(b[1], b[2], out=b[1])
+    np.greater(d2VF, 0, out=b[2])
+    np.logical_and(b[1], b[2], out=b[1])
+    np.greater(d2WF, 0, out=b[2])
+    np.logical_and(b[1], b[2], out=b[1])
+    np.greater_equal(d2VF, d2VW, out=b[2])
+    np.logical_and(b[1], b[2], out=b[1])
+    np.greater_equal(d2VF, d2WF, out=b[2])
+    np.logical_and(b[1], b[2], out=b[1])
+    np.multiply(dot, dot, out=tmp)
+    np.multiply(d2VW, d2VF, out=tmp2)
+    np.less_equal(tmp, tmp2, out=b[2])
+    np.logical_and(b[1], b[2], out=b[1])
+
+    # threshold, triangle and angle conditions on the remaining candidates only
+    cand = np.flatnonzero(b[1])
+    if len(cand):
+        sqrt_d2VW = np.sqrt(d2VW[cand])
+        sqrt_d2WF = np.sqrt(d2WF[cand])
+        sqrt_d2VF = np.sqrt(d2VF[cand])
+        perimeter = sqrt_d2VW + sqrt_d2WF + sqrt_d2VF
+        thetaV = np.degrees(np.arccos(dot[cand] / np.sqrt(tmp2[cand])))
+        if not np.issubdtype(dtype, np.floating):
+            thetaV = thetaV.astype(dtype)  # decision stores thetaV in an array of the input dtype
+        passed = (
+            np.less(sqrt_d2VW + sqrt_d2WF , limiar * sqrt_d2VF) &
+            np.less(thetaV , limiartheta) &
+            np.greater(sqrt_d2VW , perimeter * Q) &
+            np.greater(sqrt_d2WF , perimeter * Q) &
+            np.greater(sqrt_d2VF , perimeter * Q)
+        )
+        b[0][cand[passed]] = True
+
+    # Final protection decision
+    if m == n:
+        np.logical_or(out, b[0], out=out)
+    else:
+        out[rows] = b[0]
+    return out
+
+
+# decision_fused of each V against all its protectors in one call
+def decision_batched(Q,KDTREE_DIST_UPPERBOUND, limiar, limiartheta, xV, yV, xF, yF, xW, yW, xWW, yWW, xWWW, yWWW,smallN,bigN, out=None, buffers=None):
+    """
+    Batched version of decision_fused: the m potential protectors (WWW,W,WW) of every V are decided
+    in a single call on the flattened n x m block, then reduced per V.
+
+    Input:
+    xV, yV, xF, yF (arrays n)
+    xW, yW, xWW, yWW, xWWW, yWWW (arrays n x m): the m protectors of each V
+    out (bool array, optional): output buffer of length n
+    buffers (DecisionBuffers, optional): work arrays (capacity >= n*m)
+
+    Output:
+    bool array n (out): is V protected from F by at least one of its m protectors?
+    """
+    n, m = np.shape(xW)
+    VF = [np.repeat(a, m) for a in (xV, yV, xF, yF)]
+    W = [np.ravel(a) for a in (xW, yW, xWW, yWW, xWWW, yWWW)]
+    isprotected = decision_fused(Q,KDTREE_DIST_UPPERBOUND, limiar, limiartheta, *VF, *W, smallN=smallN, bigN=bigN, buffers=buffers)
+    if out is None:
+        out = np.empty(n, dtype=bool)
+    return np.any(isprotected.reshape(n, m), axis=1, out=out)
\ No newline at end of file
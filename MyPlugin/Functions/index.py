@@ -20,40 +20,51 @@ def idxneigh(mat, idxviz, IN):
 
     Returns:
     dict: A dictionary with two keys:
-        - 'idxprev': List of previous neighbor indices.
-        - 'idxnext': List of next neighbor indices.
+        - 'idxprev': Array of previous neighbor indices.
+        - 'idxnext': Array of next neighbor indices.
+    Indices that are NaN or out of range give NaN (the arrays are then float);
+    a vertex at the start (end) of its part is its own previous (next) neighbor.
     """
     colpart = f"idx_part_{IN}"
-    
-    idxnext = []
-    idxprev = []
-    
-    for idx in idxviz:
-        if np.isnan(idx):  # Preserve NaN in idxviz
-            idxnext.append(np.nan)
-            idxprev.append(np.nan)
-            continue
-        
-        idx = int(idx)  
-        if idx < 0 or idx >= mat.shape[0]:
-            idxnext.append(np.nan)
-            idxprev.append(np.nan)
-            continue
-
-        next_idx = idx + 1 if idx < mat.shape[0] - 1 else mat.shape[0] - 1
-        prev_idx = idx - 1 if idx > 0 else 0
-
-        current_part = mat.iloc[idx][colpart]
-        
-
-        if prev_idx != idx and mat.iloc[prev_idx][colpart] == current_part:
-            idxprev.append(prev_idx)
-        else:
-            idxprev.append(idx)
-
-        if next_idx != idx and mat.iloc[next_idx][colpart] == current_part:
-            idxnext.append(next_idx)
-        else:
-            idxnext.append(idx)
-    
-    return {'idxprev': idxprev, 'idxnext': idxnext}
\ No newline at end of file
+    part = np.asarray(mat[colpart]).reshape(-1)
+    n = part.shape[0]
+
+    idx = np.asarray(idxviz, dtype=float)
+    valid = ~np.isnan(idx) & (idx >= 0) & (idx < n)
+    pos = idx[valid].astype(np.int64)
+
+    prev_pos = np.maximum(pos - 1, 0)
+    next_pos = np.minimum(pos + 1, n - 1)
+    prev_pos = np.where(part[prev_pos] == part[pos], prev_pos, pos)
+    next_pos = np.where(part[next_pos] == part[pos], next_pos, pos)
+
+    if valid.all():
+        return {'idxprev': prev_pos, 'idxnext': next_pos}
+    idxprev = np.full(idx.shape, np.nan)
+    idxnext = np.full(idx.shape, np.nan)
+    idxprev[valid] = prev_pos
+    idxnext[valid] = next_pos
+    return {'idxprev': idxprev, 'idxnext': idxnext}
+
+##############################################
+    #    Precomputed neighbor table     #  
+##############################################
+
+def add_prev_next_columns(mat, IN):
+    """
+    Stores the previous and next neighbor of every vertex as integer columns.
+
+    The prev/next topology does not change after clean_and_reindex, so it is
+    computed once here and get_neighbors only has to gather from it.
+
+    Parameters:
+    mat (DataFrame or VertexStore): vertex matrix, one row per vertex (positional order).
+    IN (str): 'urb' or 'flam', suffix of the idx_part_ column.
+
+    Returns:
+    DataFrame: mat with the new columns 'idx_prev' and 'idx_next' (row positions).
+    """
+    res = idxneigh(mat, np.arange(len(mat)), IN)
+    mat['idx_prev'] = res['idxprev']
+    mat['idx_next'] = res['idxnext']
+    return mat
\ No newline at end of file
@@ -0,0 +1,134 @@
+##############################################
+    #    Libraries       #
+##############################################
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+##############################################
+    #    Import Functions       #
+##############################################
+from .vertex_store import VertexStore
+from .nearest_neighbor_function import VertexTree, nearest_indices
+from .interface_engine import compute_interface, RESULT_KEYS
+
+##############################################
+    #    Tiles      #
+##############################################
+def tile_cores(x, y, TILE_SIZE):
+    """
+    Input:
+    x, y (arrays): coordinates of the urban vertices (row 0 = artifact point, not tiled)
+    TILE_SIZE (float): side of the square tiles (m)
+
+    Output:
+    list of (core rows, (xmin, ymin, xmax, ymax)) for every non-empty tile, rows in increasing order;
+    row 0 is added to the first tile
+    """
+    rows = np.arange(1, len(x))
+    if len(rows) == 0:
+        return [(np.array([0]), (x[0], y[0], x[0], y[0]))]
+    x0, y0 = x[rows].min(), y[rows].min()
+    ix = np.floor((x[rows] - x0) / TILE_SIZE).astype(np.int64)
+    iy = np.floor((y[rows] - y0) / TILE_SIZE).astype(np.int64)
+    key = ix * (iy.max() + 1) + iy
+    order = np.argsort(key, kind='stable')
+    starts = np.flatnonzero(np.r_[True, key[order][1:] != key[order][:-1]])
+    tiles = []
+    for core in np.split(rows[order], starts[1:]):
+        cx, cy = ix[core[0] - 1], iy[core[0] - 1]
+        tiles.append((core, (x0 + cx * TILE_SIZE, y0 + cy * TILE_SIZE, x0 + (cx + 1) * TILE_SIZE, y0 + (cy + 1) * TILE_SIZE)))
+    tiles[0] = (np.r_[0, tiles[0][0]], tiles[0][1])
+    return tiles
+
+def halo_rows(x, y, part, bounds, halo):
+    """Rows within halo of the tile bounds, completed with every vertex of their parts, plus row 0 (artifact point)."""
+    xmin, ymin, xmax, ymax = bounds
+    near = (x >= xmin - halo) & (x <= xmax + halo) & (y >= ymin - halo) & (y <= ymax + halo)
+    near |= np.isin(part, part[near])
+    near[0] = True
+    return np.flatnonzero(near)
+
+def tile_store(mat, rows, feat_col, part_col):
+    """Vertex matrix of a tile: the selected rows, with idx_prev/idx_next renumbered to tile rows."""
+    return VertexStore({
+        'x': np.asarray(mat['x'])[rows],
+        'y': np.asarray(mat['y'])[rows],
+        feat_col: np.asarray(mat[feat_col])[rows],
+        part_col: np.asarray(mat[part_col])[rows],
+        # whole parts are in the tile, so the previous / next vertices are too
+        'idx_prev': np.searchsorted(rows, np.asarray(mat['idx_prev'])[rows]),
+        'idx_next': np.searchsorted(rows, np.asarray(mat['idx_next'])[rows]),
+    })
+
+def interface_of_tile(task):
+    """Main algorithm on one tile (run in a worker process): results of its core urban vertices."""
+    core, mat_urb_t, mat_flam_t, settings = task
+    K, compact_dtypes = settings.pop('K'), settings.pop('compact_dtypes')
+    urb_tree = VertexTree(mat_urb_t, compact_dtypes=compact_dtypes)
+    flam_tree = VertexTree(mat_flam_t, compact_dtypes=compact_dtypes)
+    xy = np.column_stack((mat_urb_t['x'][core], mat_urb_t['y'][core]))
+    knn_idx, knn_dists = nearest_indices(mat_flam_t, xy, k=K, return_distance=True, KDTREE_DIST_UPPERBOUND=settings['KDTREE_DIST_UPPERBOUND'],
+                                         bigN=settings['bigN'], tree=flam_tree, workers=settings['workers'], as_frame=False, canonical_ties=True)
+    return compute_interface(mat_urb_t, mat_flam_t, knn_idx, knn_dists, urb_tree, vrows=core, canonical_ties=True, verbose=False, **settings)
+
+def compute_interface_tiled(mat_urb, mat_flam, TILE_SIZE, TILE_PROCESSES, K, KS, KFS, KF, QT, KDTREE_DIST_UPPERBOUND, limiar, limiartheta,
+                            bigN, smallN, POSVALUE, NEGVALUE, workers=1, active_set=True, TESTIDX=False, threads=1, batch=0,
+                            compact_dtypes=False):
+    """
+    Tiled version of compute_interface: the urban vertices are split into square tiles of TILE_SIZE m,
+    each tile is computed in a worker process and the results are merged back in mat_urb row order
+    (idx_vert_urb order).
+
+    A tile holds its core urban vertices V plus
+        - the urban vertices within 2*D (+1 m) of the tile: protectors W of V, and of the points F, FF, FFF within D of V
+        - the flammable vertices within D (+1 m) of the tile: the K flammable neighbors of V
+        - the whole parts of all these vertices (previous / next vertices) and the artifact point (row 0)
+    so every neighbor search of a core vertex finds the same points as on the whole layer.
+    Neighbors are ordered by (distance, index) (canonical_ties) in the tiles, as in the default
+    single-process run, so the result is exactly the same as that of compute_interface.
+
+    Input: as compute_interface, plus
+    TILE_SIZE (float): side of the tiles (m), typically several times KDTREE_DIST_UPPERBOUND
+    TILE_PROCESSES (int or None): worker processes (None = all cores)
+    threads, batch : decision threads / batch size of each worker process
+    K : number of flammable neighbors to search
+    compact_dtypes : int32 / float32 neighbor tables in the tiles (see VertexTree)
+
+    Output:
+    dict as compute_interface (one value per row of mat_urb)
+    """
+    xu, yu = np.asarray(mat_urb['x']), np.asarray(mat_urb['y'])
+    xf, yf = np.asarray(mat_flam['x']), np.asarray(mat_flam['y'])
+    part_u, part_f = np.asarray(mat_urb['idx_part_urb']), np.asarray(mat_flam['idx_part_flam'])
+    settings = dict(K=K, KS=KS, KFS=KFS, KF=KF, QT=QT, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND, limiar=limiar, limiartheta=limiartheta,
+                    bigN=bigN, smallN=smallN, POSVALUE=POSVALUE, NEGVALUE=NEGVALUE, workers=workers, active_set=active_set, TESTIDX=TESTIDX, threads=threads, batch=batch,
+                    compact_dtypes=compact_dtypes)
+    tiles, tasks = [], []
+    for core, bounds in tile_cores(xu, yu, TILE_SIZE):
+        urb_rows = halo_rows(xu, yu, part_u, bounds, 2 * KDTREE_DIST_UPPERBOUND + 1)
+        flam_rows = halo_rows(xf, yf, part_f, bounds, KDTREE_DIST_UPPERBOUND + 1)
+        tiles.append((core, flam_rows))
+        tasks.append((np.searchsorted(urb_rows, core), tile_store(mat_urb, urb_rows, 'idx_feat_urb', 'idx_part_urb'),
+                      tile_store(mat_flam, flam_rows, 'idx_feat_flam', 'idx_part_flam'), dict(settings)))
+    print('tiled main algorithm:', len(tasks), 'tiles of', TILE_SIZE, 'm')
+    # worker processes are forked: Main.py is a script and cannot be re-imported by 'spawn'
+    if TILE_PROCESSES == 1 or len(tasks) == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        results = map(interface_of_tile, tasks)
+        pool = None
+    else:
+        pool = ProcessPoolExecutor(max_workers=TILE_PROCESSES, mp_context=multiprocessing.get_context('fork'))
+        results = pool.map(interface_of_tile, tasks)
+    merged = {}
+    try:
+        for t, ((core, flam_rows), result) in enumerate(zip(tiles, results), start=1):
+            result['idxF'] = flam_rows[result['idxF']]  # tile rows -> mat_flam rows
+            for key in RESULT_KEYS:
+                if key not in merged:
+                    merged[key] = np.empty(len(xu), dtype=result[key].dtype)
+                merged[key][core] = result[key]
+            print('tile', t, 'out of', len(tasks), ':', len(core), 'urban vertices')
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return merged
@@ -12,24 +12,32 @@ import numpy as np
 def get_neighbors(mat_df, idx, idxneigh_func, in_type, x_col='x', y_col='y', feat_col='idx_feat'):
     """
     Input:
-    mat_df : pandas.DataFrame
+    mat_df : pandas.DataFrame or VertexStore (positional index, as built in the main script)
     idx : array-like (Indices of the k-th neighbor)
-    idxneigh_func : function
+    idxneigh_func : function (only used when mat_df has no 'idx_prev'/'idx_next' columns)
     in_type : str : type ("flam", "urb")
     x_col : str ('x')
     y_col : str  ('y')
     feat_col : str ('idx_feat')
     Output:Tuple
     """
-    x = mat_df.loc[idx, x_col].to_numpy()
-    y = mat_df.loc[idx, y_col].to_numpy()
+    idx = np.asarray(idx)
     # Get next (FF) and previous (FFF) neighbors
-    res = idxneigh_func(mat=mat_df, idxviz=idx, IN=in_type)
-    x_next = mat_df.loc[res['idxnext'], x_col].to_numpy()
-    y_next = mat_df.loc[res['idxnext'], y_col].to_numpy()
-    x_prev = mat_df.loc[res['idxprev'], x_col].to_numpy()
-    y_prev = mat_df.loc[res['idxprev'], y_col].to_numpy()
-    idx_feat = mat_df.loc[idx, feat_col].to_numpy() # Retrieve the closest non-protected feature index
+    if 'idx_next' in mat_df.columns and 'idx_prev' in mat_df.columns:
+        idx_next = np.asarray(mat_df['idx_next'])[idx]
+        idx_prev = np.asarray(mat_df['idx_prev'])[idx]
+    else:
+        res = idxneigh_func(mat=mat_df, idxviz=idx, IN=in_type)
+        idx_next = res['idxnext']
+        idx_prev = res['idxprev']
+    # one gather of (V, next, prev) per coordinate
+    rows = np.concatenate((idx, idx_next, idx_prev))
+    n = len(idx)
+    x_all = np.asarray(mat_df[x_col])[rows]
+    y_all = np.asarray(mat_df[y_col])[rows]
+    x, x_next, x_prev = x_all[:n], x_all[n:2 * n], x_all[2 * n:]
+    y, y_next, y_prev = y_all[:n], y_all[n:2 * n], y_all[2 * n:]
+    idx_feat = np.asarray(mat_df[feat_col])[idx] # Retrieve the closest non-protected feature index
     return x, y, x_next, y_next, x_prev, y_prev, idx_feat
 
 
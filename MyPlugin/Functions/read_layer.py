@@ -0,0 +1,47 @@
+##############################################
+    #    Libraries       #
+##############################################
+import geopandas as gpd
+from shapely.geometry import box
+
+try:
+    import pyogrio  # bbox / columns push-down into GDAL
+except ImportError:
+    pyogrio = None
+try:
+    import pyarrow  # Arrow transport of pyogrio
+except ImportError:
+    pyarrow = None
+
+##############################################
+    #    Main Function       #
+##############################################
+def read_layer(path, BOX=None, margin=0, crs=None, columns=None, use_arrow=False):
+    """
+    Input:
+    path (str): layer file (shapefile, geopackage, ...)
+    BOX (dict, optional): bounding box (create_bounding_box); only the features whose envelope
+        meets BOX enlarged by margin are read (None = whole layer)
+    margin (float): added on every side of BOX (m)
+    crs (optional): CRS of BOX when it may differ from the layer's (the box is reprojected)
+    columns (list, optional): attributes to read (names the layer does not have are skipped);
+        the geometry is always read (None = all attributes)
+    use_arrow (bool): pyogrio Arrow transport (only with pyarrow installed)
+
+    Output:
+    GeoDataFrame with the index of a full read (feature ids), so a later clip selects the same rows.
+    Without pyogrio the whole layer is read.
+    """
+    if pyogrio is None:
+        return gpd.read_file(path)
+    kwargs = {'engine': 'pyogrio', 'use_arrow': use_arrow and pyarrow is not None}
+    if columns is not None:
+        fields = list(pyogrio.read_info(path)['fields'])
+        kwargs['columns'] = [name for name in columns if name in fields]
+    if BOX is None:
+        return gpd.read_file(path, **kwargs)
+    window = box(BOX["xmin"] - margin, BOX["ymin"] - margin, BOX["xmax"] + margin, BOX["ymax"] + margin)
+    bbox = gpd.GeoSeries([window], crs=crs) if crs is not None else window.bounds
+    layer = gpd.read_file(path, bbox=bbox, fid_as_index=True, **kwargs)
+    layer.index.name = None  # feature ids = row numbers of the full read
+    return layer
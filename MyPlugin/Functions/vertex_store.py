@@ -0,0 +1,64 @@
+##############################################
+    #    Libraries       #
+##############################################
+import numpy as np
+import pandas as pd
+
+##############################################
+    #    Vertex Store      #
+##############################################
+class VertexStore:
+    """
+    Columnar table backed by NumPy arrays: one 1-D array per column, all of the same length.
+
+    It replaces the pandas -> datatable -> pandas round-trips of the main script:
+    the vertex matrices (mat_urb, mat_flam) and the output table are built, searched
+    and read column by column without copies or Python objects.
+
+    store['x']            -> the NumPy array of column 'x' (no copy)
+    store['x'] = values   -> add / replace a column
+    store.take(rows)      -> new store with the selected rows (positions or boolean mask)
+    store.to_pandas()     -> pandas DataFrame (for plotting and CSV export)
+    """
+    def __init__(self, columns=None):
+        self.columns = {}
+        for name, values in (columns or {}).items():
+            self[name] = values
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(next(iter(self.columns.values())))
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __setitem__(self, name, values):
+        values = np.asarray(values).reshape(-1)
+        if self.columns and len(values) != len(self):
+            raise ValueError(f"column '{name}' has {len(values)} rows, the store has {len(self)}")
+        self.columns[name] = values
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values())
+
+    def take(self, rows):
+        return VertexStore({name: values[rows] for name, values in self.columns.items()})
+
+    def select(self, names):
+        return VertexStore({name: self.columns[name] for name in names})
+
+    def to_pandas(self):
+        return pd.DataFrame(self.columns)
+
+    @classmethod
+    def from_pandas(cls, df):
+        return cls({name: df[name].to_numpy() for name in df.columns})
@@ -185,6 +185,11 @@ class ParameterDialog(QDialog):
 
         constants = [
             ("KDTREE_DIST_UPPERBOUND", 0, 1_000_000, 500, "Maximum distance allowed in KDTree nearest neighbor search"),
+            ("KDTREE_WORKERS", -1, 1024, 1, "Threads used by the KDTree neighbor queries (-1 or 0 use all cores)"),
+            ("TILE_SIZE", 0, 100_000, 0, "Side (m) of the tiles computed in parallel processes (0 means one process)"),
+            ("TILE_PROCESSES", 0, 1024, 0, "Processes used by the tiled mode (0 uses all cores)"),
+            ("DECISION_THREADS", 1, 1024, 1, "Threads sharing the protector loops of the main algorithm (1 means no threads)"),
+            ("DECISION_BATCH", 0, 100_000_000, 0, "Urban protectors decided together per call, in (vertex, protector) pairs (0 means one call per protector)"),
             ("d_box", 0, 100_000, 500, "Box radius around central point to filter data and generate plots"),
             ("K", 1, 1000, 3, "Number of flammable neighbors to explore from each urban point"),
             ("KF", 1, 1000, 5, "Number of urban neighbors to explore from each selected flammable point"),
@@ -310,6 +315,11 @@ class ParameterDialog(QDialog):
             "limiartheta": self.limiarthetaSpin.value(),
             "QT": self.QTSpin.value(),
             "KDTREE_DIST_UPPERBOUND": self.KDTREE_DIST_UPPERBOUNDSpin.value(),
+            "KDTREE_WORKERS": self.KDTREE_WORKERSSpin.value(),
+            "TILE_SIZE": self.TILE_SIZESpin.value(),
+            "TILE_PROCESSES": self.TILE_PROCESSESSpin.value(),
+            "DECISION_THREADS": self.DECISION_THREADSSpin.value(),
+            "DECISION_BATCH": self.DECISION_BATCHSpin.value(),
             "d_box": self.d_boxSpin.value(),
             "MAXDIST": self.MAXDISTSpin.value(),
             "tolerance": self.toleranceSpin.value(),
@@ -216,6 +216,11 @@ class MyPlugin:
 
         tolerance        = params["tolerance"]
         KDTREE_DIST_UPPERBOUND= params["KDTREE_DIST_UPPERBOUND"]
+        KDTREE_WORKERS   = params["KDTREE_WORKERS"] or -1 # 0 = all cores (scipy only takes -1 or > 0)
+        TILE_SIZE        = params["TILE_SIZE"]
+        TILE_PROCESSES   = params["TILE_PROCESSES"] or None # 0 = all cores
+        DECISION_THREADS = params["DECISION_THREADS"]
+        DECISION_BATCH   = params["DECISION_BATCH"]
         bigN             = params["bigN"]
         smallN           = params["smallN"]
         POSVALUE         = params["POSVALUE"]
@@ -240,7 +245,6 @@ class MyPlugin:
         import numpy as np 
         import glob
         import matplotlib.pyplot as plt
-        import pickle
         import sys
         import datatable as dt 
         ##############################################
@@ -263,17 +267,25 @@ class MyPlugin:
         from . import plugin_imports
         create_bounding_box = plugin_imports.create_bounding_box
         azimuthVF=plugin_imports.azimuthVF
-        convert_xy=plugin_imports.convert_xy
+        read_urban_and_snap=plugin_imports.read_urban_and_snap
         crossprod=plugin_imports.crossprod
         decision=plugin_imports.decision
+        compute_interface=plugin_imports.compute_interface
+        compute_interface_tiled=plugin_imports.compute_interface_tiled
+        file_signature=plugin_imports.file_signature
+        save_results=plugin_imports.save_results
+        load_results=plugin_imports.load_results
+        read_layer=plugin_imports.read_layer
         dotprod=plugin_imports.dotprod
         extract_vertices=plugin_imports.extract_vertices
         extract_urb_vertices_and_buffered=plugin_imports.extract_urb_vertices_and_buffered
         ftype=plugin_imports.ftype
         idxneigh=plugin_imports.idxneigh  
         get_neighbors=plugin_imports.get_neighbors
+        add_prev_next_columns=plugin_imports.add_prev_next_columns
         adjust_coordinates=plugin_imports.adjust_coordinates
         nearest_indices=plugin_imports.nearest_indices
+        VertexTree=plugin_imports.VertexTree
         promote_to_multipolygon=plugin_imports.promote_to_multipolygon
         process_flammables=plugin_imports.process_flammables 
         clean_and_reindex=plugin_imports.clean_and_reindex 
@@ -311,6 +323,9 @@ class MyPlugin:
         Main_Algo = True          # Run the main algorithm part of the script
         Select = True             # Run the select part of the script
         Save = True           # Save outputs
+        ACTIVE_SET = True     # Main algorithm only evaluates the urban vertices still unresolved (same result, faster)
+        READ_USE_ARROW = True # Read the layers with the Arrow transport of pyogrio (needs pyarrow)
+        COMPACT_DTYPES = False # int32 neighbor tables, float32 neighbor distances (same result, half the memory)
 
         ##############################################
         #    Test specific location     #
@@ -326,7 +341,9 @@ class MyPlugin:
         ##############################################
         #    Test Point x0y0     #
         ##############################################
-        x0y0=convert_xy(X, Y, urban_path)
+        # the urban layer is read once (TESTIDX: around X,Y, wide enough for BOX): snapped on here and used by the Reading Part
+        urb_columns = ['layer'] + [NEWVAR] * (ADDVAR or ADDVAR2) + [NEWVAR2] * ADDVAR2
+        x0y0, urb_read = read_urban_and_snap(X, Y, urban_path, d if TESTIDX else None, KDTREE_DIST_UPPERBOUND, columns=urb_columns, use_arrow=READ_USE_ARROW)
         
         ##############################################
         #    Bounding Box    # 
@@ -342,8 +359,10 @@ class MyPlugin:
         if read:
             if CREATE_INTERFACE or TESTIDX:
                 # Process Flammable Data
-                flam1 = gpd.read_file(flammable_path) 
-                flam = promote_to_multipolygon(flam1)  
+                # TESTIDX: only the features around BOX are read (clipped to BOX below); only the attributes used
+                flam_columns = [NEWFLAMVAR] * (ADDFLAMVAR or ADDFLAMVAR2) + [NEWFLAMVAR2] * ADDFLAMVAR2
+                flam = read_layer(flammable_path, BOX if TESTIDX else None, margin=KDTREE_DIST_UPPERBOUND, columns=flam_columns, use_arrow=READ_USE_ARROW)
+                flam = promote_to_multipolygon(flam)  
                 if TESTIDX:
                     flam =process_flammables(flam, BOX) #>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> "clip"
                 flam["idflam"] = range(1, len(flam) + 1)
@@ -351,18 +370,14 @@ class MyPlugin:
                 xy_flam = extract_vertices(flam) 
                 if 'L3' not in xy_flam.columns or xy_flam['L3'].max() != len(flam):
                     raise ValueError("L3 is not properly indexed")
-                idx_L1 = xy_flam['L1']
-                idx_L2 = xy_flam['L2']
-                M = 10 ** (1 + np.ceil(np.log10(idx_L2.max())).astype(int))
-                Q = 10 ** (1 + np.ceil(np.log10(idx_L1.max())).astype(int))
                 idx_feat_flam = xy_flam['L3']
-                idx_part_flam = M * Q * idx_feat_flam + M * idx_L1 + idx_L2
+                idx_part_flam = xy_flam['part'] # dense id of the ring (L3, L2, L1), exact at any size
                 # june 2025: o create an artifial point (idx=0)  x=bigN, y=bigN. In neighbor search, when there is no eneighbor within search distance, the neighbor will be idx=0
                 mat_flam = pd.DataFrame({
                     'x': insert_bigN_at_the_beginning_of_1D_array(np.round(xy_flam['x'])),
                     'y': insert_bigN_at_the_beginning_of_1D_array(np.round(xy_flam['y'])),
                     'idx_feat_flam': insert_zero_at_the_beginning_of_1D_array(idx_feat_flam),
-                    'idx_part_flam':  insert_zero_at_the_beginning_of_1D_array(idx_part_flam.round())
+                    'idx_part_flam':  insert_zero_at_the_beginning_of_1D_array(idx_part_flam)
                 })
                 # Handle additional variables
                 if ADDFLAMVAR and not ADDFLAMVAR2:
@@ -377,10 +392,13 @@ class MyPlugin:
                         'newflamvar2': flam[NEWFLAMVAR2]
                     })
                 mat_flam = clean_and_reindex(mat_flam,"idx_part_flam","idx_vert_flam") # Remove duplicates
+                mat_flam = add_prev_next_columns(mat_flam, "flam") # prev/next vertex of each vertex, computed once
                 
                 # Process Urban Data 
-                urb1 = gpd.read_file(urban_path) # now, this contains the original polygons plus the buffers, which can be selected with 'layer'="Buffered"
-                urb = urb1.to_crs(flam.crs)
+                urb = urb_read # already read to snap X,Y (None: snapped on the whole layer)
+                if urb is None:
+                    urb = read_layer(urban_path, BOX if TESTIDX else None, margin=KDTREE_DIST_UPPERBOUND, crs=flam.crs, columns=urb_columns, use_arrow=READ_USE_ARROW) # now, this contains the original polygons plus the buffers, which can be selected with 'layer'="Buffered"
+                urb = urb.to_crs(flam.crs)
                 if TESTIDX:
                     urb = process_flammables(urb,BOX)  #>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>> "clip"
                 urb['idurb'] = range(1, len(urb) + 1)   
@@ -389,18 +407,14 @@ class MyPlugin:
                 xy_urb=extract_urb_vertices_and_buffered(urb,col='layer',value='Buffered') # returns also column "buffered" to distinguish original and "Buffered" vertices
                 if 'L3' not in xy_urb.columns or xy_urb['L3'].max() != len(urb):
                     raise ValueError("L3 is not properly indexed")
-                idx_L1 = xy_urb['L1']
-                idx_L2 = xy_urb['L2']
-                M = 10 ** (1 + np.ceil(np.log10(idx_L2.max())).astype(int))
-                Q = 10 ** (1 + np.ceil(np.log10(idx_L1.max())).astype(int))
                 idx_feat_urb = xy_urb['L3']
-                idx_part_urb = M * Q * idx_feat_urb + M * idx_L1 + idx_L2
+                idx_part_urb = xy_urb['part'] # dense id of the ring (L3, L2, L1), exact at any size
                 # june 2025: o create an artifial point (idx=0)  x=bigN, y=bigN. In neighbor search, when there is no eneighbor within search distance, the neighbor will be idx=0
                 mat_urb = pd.DataFrame({
                     'x': insert_bigN_at_the_beginning_of_1D_array(np.round(xy_urb['x'])),
                     'y': insert_bigN_at_the_beginning_of_1D_array(np.round(xy_urb['y'])),
                     'idx_feat_urb': insert_zero_at_the_beginning_of_1D_array(idx_feat_urb),
-                    'idx_part_urb': insert_zero_at_the_beginning_of_1D_array(idx_part_urb.round()),
+                    'idx_part_urb': insert_zero_at_the_beginning_of_1D_array(idx_part_urb),
                     'buffered': insert_zero_at_the_beginning_of_1D_array(xy_urb['buffered'])
                 })
                 if ADDVAR and not ADDVAR2:
@@ -416,25 +430,33 @@ class MyPlugin:
                     })
                 # idx_vert_urb takes values 1,2,3,.... AFTER removal of duplicates
                 mat_urb=clean_and_reindex(mat_urb,"idx_part_urb","idx_vert_urb") # Remove duplicates
+                mat_urb = add_prev_next_columns(mat_urb, "urb") # prev/next vertex of each vertex, computed once
 
                 # build datatables -- however they are going to be converted back to dataframe in 209-210 !!!
                 mat_urb_dt = dt.Frame(mat_urb)
                 mat_flam_dt = dt.Frame(mat_flam)
+                # KD-trees built once per vertex matrix and reused by every neighbour search below
+                urb_tree = VertexTree(mat_urb_dt, compact_dtypes=COMPACT_DTYPES)
+                flam_tree = VertexTree(mat_flam_dt, compact_dtypes=COMPACT_DTYPES)
                 
                 # search nearest flammable neighbor 
-                idxUF_idx=nearest_indices(mat_urb_dt,mat_flam_dt,k=1,KDTREE_DIST_UPPERBOUND= KDTREE_DIST_UPPERBOUND,bigN=bigN)
+                idxUF_idx=nearest_indices(mat_urb_dt,mat_flam_dt,k=1,KDTREE_DIST_UPPERBOUND= KDTREE_DIST_UPPERBOUND,bigN=bigN,tree=urb_tree,workers=KDTREE_WORKERS)
                 mat_flam_dt['idx_vert_urb'] = idxUF_idx # urban vertices of flam vertices
-                idxFU_idx=nearest_indices(mat_flam_dt,mat_urb_dt,k=1, KDTREE_DIST_UPPERBOUND = KDTREE_DIST_UPPERBOUND,bigN=bigN)
+                idxFU_idx=nearest_indices(mat_flam_dt,mat_urb_dt,k=1, KDTREE_DIST_UPPERBOUND = KDTREE_DIST_UPPERBOUND,bigN=bigN,tree=flam_tree,workers=KDTREE_WORKERS)
                 mat_urb_dt['idx_vert_flam'] = idxFU_idx # Flammable neighbors of urban vertices
 
             distances_squared = (mat_urb_dt["x"].to_numpy() - x0)**2 + (mat_urb_dt["y"].to_numpy() - y0)**2
             id0 = np.argmin(distances_squared) 
             # determining the K Flam neighbors up to distance D meters from each urban neighbor
             # Calculating the distance from each vertice of the urban polygons to each vertice within D meters  of the flammable polygons
-            knn_idx,knn_dists=nearest_indices(mat_flam_dt,mat_urb_dt,k=K, return_distance=True,KDTREE_DIST_UPPERBOUND= KDTREE_DIST_UPPERBOUND,bigN=bigN) # neighbors urban X Flam
+            knn_idx,knn_dists=nearest_indices(mat_flam_dt,mat_urb_dt,k=K, return_distance=True,KDTREE_DIST_UPPERBOUND= KDTREE_DIST_UPPERBOUND,bigN=bigN,tree=flam_tree,workers=KDTREE_WORKERS) # neighbors urban X Flam
             FICHNAME_STEM= f"interface_K{K}_KF{KF}_limiar{round(limiar * 100)}_theta{limiartheta}_QT{Q}_{extraname}_{round(x0)}_y_{round(y0)}_d_{d}"
-            FICHNAME= FICHNAME_STEM+ ".pickle"
+            FICHNAME= FICHNAME_STEM+ ".results" # folder: one .npy per result array + manifest.json with RESULT_PARAMS
             fichs = glob.glob(os.path.join(OUTPUT_FOLDER, FICHNAME))
+            # everything the results depend on (the name only holds part of it)
+            RESULT_PARAMS = dict(files=[file_signature(path) for path in (flammable_path, urban_path)], option=option, d_box=d, x0=x0, y0=y0,
+                                 TESTIDX=TESTIDX, K=K, KF=KF, limiar=limiar, limiartheta=limiartheta, QT=Q, KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND,
+                                 bigN=bigN, smallN=smallN, POSVALUE=POSVALUE, NEGVALUE=NEGVALUE, canonical_ties=True)
 
             # save urb and flam
 
@@ -450,113 +472,28 @@ class MyPlugin:
         if Main_Algo : 
             mat_urb_df = mat_urb_dt.to_pandas()
             mat_flam_df = mat_flam_dt.to_pandas()
-            if CREATE_INTERFACE or TESTIDX or len(fichs) == 0:
-                not_interface = np.full(len(mat_urb_df), True)  
-                dF = np.full(len(mat_urb_df), POSVALUE)
-                # Distance to farthest non-protected F
-                dFplus = np.full(len(mat_urb_df), NEGVALUE)
-                # Azimuth of the closest non-protected Flam (in degrees)
-                azF = np.full(len(mat_urb_df), NEGVALUE)
-                azFplus = np.full(len(mat_urb_df), NEGVALUE)
-                # Index of the closest non-protected Flam
-                iF = np.full(len(mat_urb_df), NEGVALUE)
-                # Determine KF urban neighbors W of urban V
-                # Get nearest neighbor 
-                kvw_idx,kvw_dists = nearest_indices(mat_urb_dt,k=KF, return_distance=True,KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND,bigN=bigN) # (GROUP 1 of potential protectors) KF Urban neighbors of urban vertices  kvw$nn.idx[kvw$nn.idx==0]<-NA # NEW
-                xV = mat_urb_df['x'].to_numpy()
-                yV = mat_urb_df['y'].to_numpy()
-                k=1
-                for k in KS: # cycle through K FLAM neighbors of urban vertice 
-                    print('k', k, 'out of', len(KS),'flammable neighbors')
-                    threetimesprotected = np.full(len(mat_urb_df), True)
-                    # the goal is to try to show that it is protected from its k-th flammable neighbor
-                    # xyd gets the index of the k-th F-neighbor, and the distance to it
-                    # Get the k-th F-neighbor index for urban vertices, allowing for NA/None values
-                    idxF = knn_idx.iloc[:, k-1]
-                    xF, yF, xFF, yFF, xFFF, yFFF, idxfeatF = get_neighbors(mat_df=mat_flam_df, idx=idxF, idxneigh_func=idxneigh,  in_type="flam",x_col='x', y_col='y', feat_col='idx_feat_flam')
-                    # Flamm point closest to xF,yF over the edge (F,FF) - next
-                    xFF,yFF = adjust_coordinates(xF, yF, xFF, yFF, xV, yV) # array
-                    # Flamm point closest to xF,yF over the edge (F,FFF) -- prev
-                    xFFF, yFFF=adjust_coordinates (xF, yF, xFFF,yFFF,xV,yV)
-                    xFback=xF
-                    yFback=yF
-                    idxFviz=3 
-                    for idxFviz in range(1, 4):
-                        protected = np.full(len(mat_urb_df), False, dtype=bool) # Initialize protection status: it is not protected
-                        if idxFviz == 2:
-                            xF = xFF
-                            yF = yFF
-                        elif idxFviz == 3:
-                            xF = xFFF
-                            yF = yFFF
-                        if not TESTIDX:
-                            print(f"iteration {k} among F-neighbors and idxFviz={idxFviz} in 3")
-                        # if idxfeatF isn't defined 
-                        # # if idxfeatF is not defined:
-                        xF = np.where(np.isnan(xF), bigN, xF)
-                        yF = np.where(np.isnan(yF), bigN, yF)
-                        idxfeatF = np.where(np.isnan(idxfeatF), NEGVALUE, idxfeatF)
-                        # GROUP 1 of potential protectors:  KF Urban neighbors of urban vertices
-                        # Dec 2018: moved outside  cycle GROUP 2: it should be k and not j, since kvw does not depend on the index of the flammable vertices
-                        j =1
-                        for j in KFS:  # Cycle through URB neighbors of selected Flam vertices GROUP 1
-                            if j%20==0 and idxFviz==1 : print(j, 'out of', len(KFS), 'urban neighbors of V')
-                            if not TESTIDX and j % 10 == 0:
-                                print(f"GROUP1: iteration {j} among urban neighbors of V")
-                            d2VW = kvw_dists.iloc[:, j-1] ** 2  # Distance between urban vertex V and its urban neighbor W
-                            xW1, yW1, xWW1, yWW1, xWWW1, yWWW1, _ = get_neighbors( mat_df=mat_urb_df,  idx=kvw_idx.iloc[:, j-1],  idxneigh_func=idxneigh,  in_type="urb", x_col='x',  y_col='y', feat_col='idx_feat_urb' )
-                            d2WF = (xW1 - xF) ** 2 + (yW1 - yF) ** 2  # distance from W to the k-th flammable neighbor F of V
-                            # update protected
-                            isprotected1 = decision(Q/100,KDTREE_DIST_UPPERBOUND,limiar,limiartheta,xV,yV,xF,yF,xW1,yW1,xWW1,yWW1,xWWW1,yWWW1,smallN,bigN,verbose=False,log_file="decision_table1.csv")
-                            protected = protected | isprotected1
-                        # GROUP 2 of potential protectors: KF Urban neighbors of selected flammable vertices
-                        # urban neighbors of selected flammable vertices (xF,yF)
-                        # nn2 does not accept NAs
-                        query = dt.Frame(np.column_stack((xF, yF)), names=['x', 'y'])
-                        kfw_idx, kfw_dists = nearest_indices(mat_urb_dt,query,k=KF, return_distance=True,KDTREE_DIST_UPPERBOUND=KDTREE_DIST_UPPERBOUND,bigN=bigN)
-                        for j in KFS:  # Cycle through URB neighbors of selected Flam vertices GROUP 1
-                            if j%20==0 and idxFviz==1 : print(j, 'out of', len(KFS), 'urban neighbors of Flam neighbors of V')
-                            if not TESTIDX and j % 10 == 0:
-                                print(f"GROUP2: iteration {j} among urban neighbors of Flam neighbors of V")
-                            d2WF = kfw_dists.iloc[:, j-1] ** 2  # Distance between urban vertex V and its urban neighbor W
-                            xW2, yW2, xWW2, yWW2, xWWW2, yWWW2, _ = get_neighbors( mat_df=mat_urb_df,  idx=kfw_idx.iloc[:, j-1], idxneigh_func=idxneigh,  in_type="urb", x_col='x',  y_col='y', feat_col='idx_feat_urb' )
-                            d2VW = (xW2 - xV) ** 2 + (yW2 - yV) ** 2  # distance from W to the k-th flammable neighbor F of V
-                            isprotected2 = decision(Q/100,KDTREE_DIST_UPPERBOUND,limiar,limiartheta,xV,yV,xF,yF,xW2,yW2,xWW2,yWW2,xWWW2,yWWW2,smallN,bigN,verbose=False,log_file="decision_table2.csv")
-                            protected = protected | isprotected2
-                        # set2019: define new variables d2VF, azVF and idxVF that are updated to depend on the closest neighbor among F,FF,FFF
-                        # Calculate the current squared distance between V and F
-                        d2VFcurrent = (xV - xF)**2 + (yV - yF)**2
-                        azVFcurrent = azimuthVF(xV=xV, yV=yV, xF=xF, yF=yF)  
-                        idxVFcurrent = idxfeatF
-                        if idxFviz == 1:
-                            d2VF = d2VFcurrent
-                            azVF = azVFcurrent
-                            idxVF = idxVFcurrent
-                        elif idxFviz > 1:
-                            idxVF = (d2VFcurrent < d2VF) * idxVFcurrent + (d2VFcurrent >= d2VF) * idxVF
-                            azVF = (d2VFcurrent < d2VF) * azVFcurrent + (d2VFcurrent >= d2VF) * azVF
-                            d2VF = (d2VFcurrent < d2VF) * d2VFcurrent + (d2VFcurrent >= d2VF) * d2VF
-                        threetimesprotected = threetimesprotected & protected
-                    # notinterface will be FALSE if V is not protected from its k-th F-neighbor
-                    # 28ago2019: do like dF to set indF from current idxfeatF, and azF from current azVF
-                    iF = (threetimesprotected * iF) + \
-                    (~threetimesprotected * ((d2VF < dF**2) * idxVF + (d2VF >= dF**2) * iF))
-                    azF = (threetimesprotected * azF) + \
-                    (~threetimesprotected * ((d2VF < dF**2) * azVF + \
-                                                        (d2VF >= dF**2) * azF))
-                    dF = (threetimesprotected * dF) + \
-                    (~threetimesprotected * ((d2VF < dF**2) * np.sqrt(d2VF) + \
-                                                        (d2VF >= dF**2) * dF))
-                    not_interface = not_interface & threetimesprotected
-                interface = ~not_interface
-                interface[pd.isna(knn_idx.iloc[:, 0])] = False
-                if not TESTIDX:
-                    save_path = os.path.join(OUTPUT_FOLDER, f"{FICHNAME}.pkl")
-                    with open(save_path, 'wb') as f:
-                        pickle.dump([interface, dF, azF, iF, azFplus, dFplus], f)
+            results = None
             if not CREATE_INTERFACE and not TESTIDX and len(fichs) > 0:
-                with open(fichs[0], 'rb') as f:
-                    data = pickle.load(f)
+                # results of a previous run (memory-mapped; None if computed with other parameters)
+                results = load_results(fichs[0], RESULT_PARAMS)
+            if results is None:
+                if TILE_SIZE > 0:
+                    # tiles of TILE_SIZE m computed in parallel processes, merged in idx_vert_urb order
+                    result = compute_interface_tiled(mat_urb_df, mat_flam_df, TILE_SIZE, TILE_PROCESSES, K, KS, KFS, KF, Q, KDTREE_DIST_UPPERBOUND, limiar, limiartheta,
+                                                     bigN, smallN, POSVALUE, NEGVALUE, workers=KDTREE_WORKERS, active_set=ACTIVE_SET, TESTIDX=TESTIDX,
+                                                     threads=DECISION_THREADS, batch=DECISION_BATCH, compact_dtypes=COMPACT_DTYPES)
+                else:
+                    result = compute_interface(mat_urb_df, mat_flam_df, knn_idx.to_numpy(), knn_dists.to_numpy(), urb_tree, KS, KFS, KF, Q, KDTREE_DIST_UPPERBOUND, limiar, limiartheta,
+                                               bigN, smallN, POSVALUE, NEGVALUE, workers=KDTREE_WORKERS, active_set=ACTIVE_SET, TESTIDX=TESTIDX,
+                                               threads=DECISION_THREADS, batch=DECISION_BATCH)
+                interface, dF, azF, iF = result['interface'], result['dF'], result['azF'], result['iF']
+                azFplus, dFplus, idxF = result['azFplus'], result['dFplus'], result['idxF']
+                if not TESTIDX:
+                    save_results(os.path.join(OUTPUT_FOLDER, FICHNAME), result, RESULT_PARAMS)
+            else:
+                print('results read from', fichs[0])
+                interface, dF, azF, iF = results['interface'], results['dF'], results['azF'], results['iF']
+                azFplus, dFplus, idxF = results['azFplus'], results['dFplus'], results['idxF']
 
         ##############################################
         # Select Interface and Add Features
@@ -677,8 +614,9 @@ class MyPlugin:
         urb_pt_layer = load_datatable_as_point_layer(matUrbDF, "Urb_Vertices", crs_code, "x", "y")
         flam_poly = create_vector_layer_from_gdf(flam, "Flammable_Polygons", crs_str)
         urb_poly = create_vector_layer_from_gdf(urb, "Urban_Polygons", crs_str)
-        flam_layer=create_vector_layer_from_gdf(flam1, "flammable_Area", crs_str)
-        urb_layer=create_vector_layer_from_gdf(urb1, "Urban_Area", crs_str)
+        # whole input layers, added straight from the files (the Reading Part only reads the window and the attributes used)
+        flam_layer = QgsVectorLayer(flammable_path, "flammable_Area", "ogr")
+        urb_layer = QgsVectorLayer(urban_path, "Urban_Area", "ogr")
         # -------------------------------------------------------------
         # 2.1) Style layers
         # -------------------------------------------------------------
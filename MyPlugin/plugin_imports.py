@@ -13,4 +13,9 @@ from .Functions.ftype import *
 from .Functions.azimuthVF_function import *
 from .Functions.convert_xy_into_urban_closest_vertex import *
 from .Functions.extract_urb_vertices_and_buffered import *
-
+from .Functions.vertex_store import *
+from .Functions.interface_engine import *
+from .Functions.interface_tiles import *
+from .Functions.vertex_cache import *
+from .Functions.result_store import *
+from .Functions.read_layer import *